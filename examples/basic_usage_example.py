@@ -10,10 +10,12 @@ import polars as pl
 import sys
 import os
 
-# Add src directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-from core.polars_demo import PolarsDataProcessor
+try:
+    from core.polars_demo import PolarsDataProcessor
+except ImportError:
+    # Running from a checkout without `pip install -e .`
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+    from core.polars_demo import PolarsDataProcessor
 
 
 def example_1_basic_dataframe():
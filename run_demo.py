@@ -10,11 +10,14 @@ This script runs a complete demonstration of all repository features.
 import sys
 import os
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
-from core.polars_demo import PolarsDataProcessor
-from examples.advanced_example import AdvancedPolarsProcessor
+try:
+    from core.polars_demo import PolarsDataProcessor
+    from examples.advanced_example import AdvancedPolarsProcessor
+except ImportError:
+    # Running from a checkout without `pip install -e .`
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+    from core.polars_demo import PolarsDataProcessor
+    from examples.advanced_example import AdvancedPolarsProcessor
 import polars as pl
 
 
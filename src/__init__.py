@@ -1,2 +1,17 @@
-from .core.polars_demo import PolarsDataProcessor
-from .examples.advanced_example import AdvancedPolarsProcessor
+import importlib
+
+_EXPORTS = {
+    "PolarsDataProcessor": ".core.polars_demo",
+    "AdvancedPolarsProcessor": ".examples.advanced_example",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    # Importacao preguicosa: `import src` nao carrega o Polars
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
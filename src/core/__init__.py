@@ -1 +1,27 @@
+"""
+Submodulos do processador, importados sob demanda: `from core import StageCache`
+so carrega `core.stage_cache` (e o Polars) no primeiro acesso.
+"""
 
+import importlib
+
+_EXPORTS = {
+    "PolarsDataProcessor": ".polars_demo",
+    "IndexRegistry": ".indexing",
+    "SchemaInferenceService": ".schema_inference",
+    "OutOfCoreExecutor": ".out_of_core",
+    "StageCache": ".stage_cache",
+    "MemoryGovernor": ".memory",
+    "QueryService": ".server",
+    "QueryClient": ".server",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
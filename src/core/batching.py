@@ -0,0 +1,137 @@
+"""
+Polars High-Speed DataFrames
+Author: Gabriel Demetrios Lafis
+Year: 2025
+
+Leitura de CSV em lotes de tamanho fixo para ETL com memoria limitada.
+Os lotes sao produzidos por um gerador: o proximo lote so e lido quando o
+consumidor pede (backpressure natural), e o tamanho do lote pode ser ajustado
+a memoria disponivel na maquina.
+"""
+
+import os
+import re
+import polars as pl
+from typing import Callable, Iterator, List, Optional
+
+DEFAULT_MEMORY_FRACTION = 0.1
+MIN_BATCH_ROWS = 1_000
+MAX_BATCH_ROWS = 5_000_000
+
+
+def available_memory() -> int:
+    """Memoria disponivel em bytes (MemAvailable no Linux, paginas livres como fallback)."""
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+
+
+def adaptive_batch_size(file_path: str, memory_fraction: float = DEFAULT_MEMORY_FRACTION,
+                        sample_rows: int = 1_000, **kwargs) -> int:
+    """
+    Estima quantas linhas cabem em `memory_fraction` da memoria disponivel,
+    a partir do tamanho em memoria de uma amostra das primeiras linhas.
+    """
+    sample = pl.read_csv(file_path, n_rows=sample_rows, **kwargs)
+    if sample.height == 0:
+        return MIN_BATCH_ROWS
+    bytes_per_row = max(sample.estimated_size() / sample.height, 1.0)
+    rows = int(available_memory() * memory_fraction / bytes_per_row)
+    return max(MIN_BATCH_ROWS, min(rows, MAX_BATCH_ROWS))
+
+
+def _rebatch(chunks: Iterator[pl.DataFrame], batch_size: int) -> Iterator[pl.DataFrame]:
+    """Reagrupa pedacos de tamanho arbitrario em lotes de exatamente `batch_size` linhas."""
+    pending: List[pl.DataFrame] = []
+    pending_rows = 0
+    for chunk in chunks:
+        while chunk.height > 0:
+            take = min(batch_size - pending_rows, chunk.height)
+            pending.append(chunk.slice(0, take))
+            pending_rows += take
+            chunk = chunk.slice(take)
+            if pending_rows == batch_size:
+                yield pl.concat(pending, rechunk=True)
+                pending, pending_rows = [], 0
+    if pending_rows:
+        yield pl.concat(pending, rechunk=True)
+
+
+def iter_csv_batches(file_path: str, batch_size: Optional[int] = None,
+                     memory_fraction: float = DEFAULT_MEMORY_FRACTION,
+                     **kwargs) -> Iterator[pl.DataFrame]:
+    """
+    Gera DataFrames de `batch_size` linhas (o ultimo pode ser menor) a partir de um CSV.
+    Sem `batch_size`, o tamanho e escolhido por `adaptive_batch_size`.
+    """
+    if batch_size is None:
+        batch_size = adaptive_batch_size(file_path, memory_fraction, **kwargs)
+    if batch_size <= 0:
+        raise ValueError("batch_size deve ser positivo")
+
+    lf = pl.scan_csv(file_path, **kwargs)
+    if hasattr(lf, "collect_batches"):
+        chunks = lf.collect_batches(chunk_size=batch_size)
+    else:
+        # Versoes antigas do Polars: leitor em lotes nativo
+        reader = pl.read_csv_batched(file_path, batch_size=batch_size, **kwargs)
+        chunks = _iter_batched_reader(reader)
+    yield from _rebatch(chunks, batch_size)
+
+
+def _iter_batched_reader(reader) -> Iterator[pl.DataFrame]:
+    while True:
+        batches = reader.next_batches(1)
+        if not batches:
+            return
+        yield from batches
+
+
+_PART_NAME = re.compile(r"part-(\d+)\.parquet")
+
+
+def write_batches_to_dataset(batches: Iterator[pl.DataFrame], dataset_dir: str,
+                             transform: Optional[Callable[[pl.DataFrame], pl.DataFrame]] = None,
+                             **kwargs) -> List[str]:
+    """
+    Escreve cada lote (opcionalmente transformado) como um arquivo Parquet
+    `part-NNNNN.parquet` em `dataset_dir`, numerado apos a maior parte existente.
+    Retorna os caminhos escritos. O conjunto pode ser lido com `pl.scan_parquet(dir)`.
+    """
+    os.makedirs(dataset_dir, exist_ok=True)
+    numbers = [int(match.group(1)) for match in map(_PART_NAME.fullmatch, os.listdir(dataset_dir)) if match]
+    part = max(numbers, default=-1) + 1
+    written = []
+    for batch in batches:
+        if transform is not None:
+            batch = transform(batch)
+        while True:
+            path = os.path.join(dataset_dir, f"part-{part:05d}.parquet")
+            part += 1
+            try:
+                # Criacao exclusiva: nunca sobrescreve uma parte (nem de outro escritor)
+                with open(path, "xb") as handle:
+                    batch.write_parquet(handle, **kwargs)
+                break
+            except FileExistsError:
+                continue
+        written.append(path)
+    return written
+
+
+def sink_csv_to_parquet(csv_path: str, parquet_path: str,
+                        transform: Optional[Callable[[pl.LazyFrame], pl.LazyFrame]] = None,
+                        csv_options: Optional[dict] = None, **kwargs):
+    """
+    Converte um CSV em Parquet com o motor de streaming (`sink_parquet`), sem
+    materializar o arquivo. `transform` recebe e devolve um LazyFrame.
+    """
+    lf = pl.scan_csv(csv_path, **(csv_options or {}))
+    if transform is not None:
+        lf = transform(lf)
+    lf.sink_parquet(parquet_path, **kwargs)
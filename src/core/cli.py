@@ -0,0 +1,148 @@
+"""
+Polars High-Speed DataFrames
+Author: Gabriel Demetrios Lafis
+Year: 2025
+
+Interface de linha de comando para jobs curtos do processador.
+O Polars e o processador so sao importados depois da analise dos argumentos,
+de modo que `--help` e erros de uso respondem sem o custo de importacao.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+
+def _processor():
+    from .polars_demo import PolarsDataProcessor
+    return PolarsDataProcessor()
+
+
+def _read(processor, path: str):
+    if path.lower().endswith(".csv"):
+        return processor.read_csv_fast(path)
+    return processor.scan_file(path).collect()
+
+
+def _emit(df, output: Optional[str]):
+    """Grava o resultado em `output` (CSV/Parquet pela extensao) ou imprime na saida padrao."""
+    if output is None:
+        print(df)
+    elif output.lower().endswith(".parquet"):
+        df.write_parquet(output)
+    else:
+        df.write_csv(output)
+
+
+def _cmd_stats(args) -> int:
+    processor = _processor()
+    df = _read(processor, args.file)
+    _emit(processor.calculate_summary_statistics(df, args.group_col, args.agg_col), args.output)
+    return 0
+
+
+def _cmd_filter(args) -> int:
+    import polars as pl
+    processor = _processor()
+    df = _read(processor, args.file)
+    _emit(processor.filter_by_condition(df, pl.sql_expr(args.where)), args.output)
+    return 0
+
+
+def _cmd_top_k(args) -> int:
+    processor = _processor()
+    result = processor.top_k_from_file(args.file, args.k, args.by, descending=not args.ascending)
+    _emit(result, args.output)
+    return 0
+
+
+def _cmd_sql(args) -> int:
+    processor = _processor()
+    df = _read(processor, args.file)
+    _emit(processor.execute_sql_query({args.table: df}, args.query), args.output)
+    return 0
+
+
+def _cmd_convert(args) -> int:
+    processor = _processor()
+    if args.source.lower().endswith(".csv") and args.target.lower().endswith(".parquet"):
+        processor.sink_csv_to_parquet(args.source, args.target)
+    else:
+        _emit(_read(processor, args.source), args.target)
+    return 0
+
+
+def _cmd_serve(args) -> int:
+    from .server import QueryService, make_server
+    service = QueryService(max_concurrent=args.max_concurrent, queue_timeout=args.queue_timeout)
+    for spec in args.table:
+        name, _, path = spec.partition("=")
+        service.register(name, path, mmap=args.mmap)
+    server = make_server(service, host=args.host, port=args.port, unix_socket=args.socket)
+    where = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"Servindo {', '.join(service.describe()) or 'nenhuma tabela'} em {where}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="polars-demo", description="Jobs de processamento de dados com Polars."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name: str, handler, help_text: str) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=help_text)
+        command.set_defaults(handler=handler)
+        return command
+
+    stats = add_command("stats", _cmd_stats, "estatisticas agrupadas de uma coluna")
+    stats.add_argument("file")
+    stats.add_argument("--group-col", required=True)
+    stats.add_argument("--agg-col", required=True)
+
+    filter_ = add_command("filter", _cmd_filter, "filtra linhas com uma expressao SQL")
+    filter_.add_argument("file")
+    filter_.add_argument("--where", required=True, help="ex.: \"age > 30 AND city = 'Paris'\"")
+
+    top_k = add_command("top-k", _cmd_top_k, "k maiores linhas segundo uma coluna (streaming)")
+    top_k.add_argument("file")
+    top_k.add_argument("--by", required=True)
+    top_k.add_argument("-k", type=int, default=10)
+    top_k.add_argument("--ascending", action="store_true", help="retorna as k menores")
+
+    sql = add_command("sql", _cmd_sql, "executa uma query SQL sobre um arquivo")
+    sql.add_argument("file")
+    sql.add_argument("--query", required=True)
+    sql.add_argument("--table", default="data")
+
+    convert = add_command("convert", _cmd_convert, "converte entre CSV, Parquet e IPC")
+    convert.add_argument("source")
+    convert.add_argument("target")
+
+    serve = add_command("serve", _cmd_serve, "servidor local de consultas com tabelas residentes")
+    serve.add_argument("--table", action="append", default=[], metavar="NOME=ARQUIVO")
+    serve.add_argument("--mmap", action="store_true", help="mapeia arquivos IPC em vez de copia-los")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--socket", help="escuta num socket Unix em vez de TCP")
+    serve.add_argument("--max-concurrent", type=int, default=4)
+    serve.add_argument("--queue-timeout", type=float, default=5.0)
+
+    for command in (stats, filter_, top_k, sql):
+        command.add_argument("-o", "--output", help="arquivo de saida (.csv ou .parquet)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+"""
+Polars High-Speed DataFrames
+Author: Gabriel Demetrios Lafis
+Year: 2025
+
+Indices secundarios em memoria para DataFrames residentes. Um indice hash responde
+a predicados de igualdade em O(1) e um indice ordenado responde a predicados de
+intervalo com busca binaria (`search_sorted`) em O(log n), evitando a varredura
+linear de `DataFrame.filter` em chamadas repetidas sobre o mesmo DataFrame.
+"""
+
+import bisect
+import ctypes
+import datetime
+import json
+import math
+import weakref
+import polars as pl
+from typing import Any, Dict, List, Optional, Tuple
+
+_COMPARISON_OPS = {"Eq", "Lt", "LtEq", "Gt", "GtEq"}
+_MIRRORED_OPS = {"Eq": "Eq", "Lt": "Gt", "LtEq": "GtEq", "Gt": "Lt", "GtEq": "LtEq"}
+
+
+class HashIndex:
+    """Indice hash: valor da chave -> posicoes das linhas (em ordem original)."""
+
+    kind = "hash"
+
+    def __init__(self, series: pl.Series):
+        positions = (
+            series.to_frame("key")
+            .with_row_index("row")
+            .drop_nulls("key")
+            .group_by("key", maintain_order=True)
+            .agg(pl.col("row"))
+        )
+        self._rows: Dict[Any, List[int]] = dict(
+            zip(positions["key"].to_list(), positions["row"].to_list())
+        )
+
+    def lookup(self, value: Any) -> List[int]:
+        """Retorna as posicoes das linhas cuja chave e igual a `value`."""
+        return self._rows.get(value, [])
+
+
+class SortedIndex:
+    """Indice ordenado: valores nao nulos ordenados e suas posicoes originais."""
+
+    kind = "sorted"
+
+    def __init__(self, series: pl.Series):
+        ordered = (
+            series.to_frame("key")
+            .with_row_index("row")
+            .drop_nulls("key")
+            .sort("key", maintain_order=True)
+        )
+        self._rows = ordered["row"]
+        keys = ordered["key"]
+        if keys.dtype.is_float():
+            # NaN fica no fim da ordenacao e e maior que qualquer valor no Polars
+            keys = keys.filter(keys.is_not_nan())
+        if keys.dtype.is_numeric() or keys.dtype.is_temporal() or keys.dtype in (pl.String, pl.Boolean):
+            # Busca binaria em Python (`bisect`) custa microssegundos; `search_sorted`
+            # cria uma Series a cada chamada
+            self._keys = keys.to_list()
+        else:
+            # Ordem fisica (ex.: categoricas) pode diferir da ordem dos valores Python
+            self._keys = keys.set_sorted()
+
+    def _search(self, value: Any, side: str) -> int:
+        if isinstance(self._keys, list):
+            search = bisect.bisect_left if side == "left" else bisect.bisect_right
+            return search(self._keys, value)
+        return int(self._keys.search_sorted(value, side=side))
+
+    def lookup(self, value: Any) -> List[int]:
+        """Retorna as posicoes das linhas cuja chave e igual a `value`."""
+        return self.range(value, value, True, True)
+
+    def positions(self, low: Any = None, high: Any = None,
+                  low_inclusive: bool = True, high_inclusive: bool = True) -> pl.Series:
+        """Como `range`, mas devolve as posicoes como Series (pronta para `df[...]`)."""
+        start = 0
+        end = len(self._rows)
+        if low is not None:
+            start = self._search(low, "left" if low_inclusive else "right")
+        if high is not None:
+            end = self._search(high, "right" if high_inclusive else "left")
+        if start >= end:
+            return self._rows.clear()
+        return self._rows.slice(start, end - start).sort()
+
+    def range(self, low: Any = None, high: Any = None,
+              low_inclusive: bool = True, high_inclusive: bool = True) -> List[int]:
+        """
+        Retorna as posicoes (em ordem original) das linhas com chave no intervalo
+        definido por `low`/`high`; `None` deixa o limite em aberto.
+        """
+        return self.positions(low, high, low_inclusive, high_inclusive).to_list()
+
+
+_INDEX_TYPES = {"hash": HashIndex, "sorted": SortedIndex}
+
+
+class _ArrowArray(ctypes.Structure):
+    pass
+
+
+_ArrowArray._fields_ = [
+    ("length", ctypes.c_int64),
+    ("null_count", ctypes.c_int64),
+    ("offset", ctypes.c_int64),
+    ("n_buffers", ctypes.c_int64),
+    ("n_children", ctypes.c_int64),
+    ("buffers", ctypes.POINTER(ctypes.c_void_p)),
+    ("children", ctypes.POINTER(ctypes.POINTER(_ArrowArray))),
+    ("dictionary", ctypes.POINTER(_ArrowArray)),
+    ("release", ctypes.CFUNCTYPE(None, ctypes.POINTER(_ArrowArray))),
+    ("private_data", ctypes.c_void_p),
+]
+
+
+class _ArrowArrayStream(ctypes.Structure):
+    pass
+
+
+_ArrowArrayStream._fields_ = [
+    ("get_schema", ctypes.c_void_p),
+    ("get_next", ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(_ArrowArrayStream), ctypes.POINTER(_ArrowArray))),
+    ("get_last_error", ctypes.c_void_p),
+    ("release", ctypes.c_void_p),
+    ("private_data", ctypes.c_void_p),
+]
+
+_capsule_pointer = ctypes.PYFUNCTYPE(ctypes.c_void_p, ctypes.py_object, ctypes.c_char_p)(
+    ("PyCapsule_GetPointer", ctypes.pythonapi)
+)
+
+
+def _array_buffers(array: _ArrowArray) -> Tuple:
+    buffers = [array.offset, array.length] + [array.buffers[i] for i in range(array.n_buffers)]
+    for i in range(array.n_children):
+        buffers.extend(_array_buffers(array.children[i].contents))
+    if array.dictionary:
+        buffers.extend(_array_buffers(array.dictionary.contents))
+    return tuple(buffers)
+
+
+def column_buffers(series: pl.Series) -> Optional[Tuple]:
+    """
+    Enderecos dos buffers de memoria de `series`, chunk a chunk, obtidos pela
+    interface C do Arrow (exportacao sem copia). Qualquer alteracao de valores
+    in-place gera buffers novos (copy-on-write), mudando o resultado. Retorna
+    `None` para tipos que nao podem ser exportados.
+    """
+    try:
+        capsule = series.__arrow_c_stream__()
+    except Exception:
+        return None
+    stream = ctypes.cast(
+        _capsule_pointer(capsule, b"arrow_array_stream"), ctypes.POINTER(_ArrowArrayStream)
+    ).contents
+    chunks = []
+    while True:
+        array = _ArrowArray()
+        if stream.get_next(ctypes.byref(stream), ctypes.byref(array)) != 0:
+            return None
+        if not array.release:
+            return tuple(chunks)
+        chunks.append(_array_buffers(array))
+        array.release(ctypes.byref(array))
+
+
+_PYTHON_DTYPES = {bool: pl.Boolean, str: pl.String, datetime.date: pl.Date, datetime.datetime: pl.Datetime}
+
+
+def _literal_matches(value: Any, dtype: pl.DataType) -> bool:
+    """Indica se o literal `value` e comparavel com a coluna de tipo `dtype` sem conversao."""
+    if value is None:
+        return True
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return dtype.is_numeric()
+    literal = _PYTHON_DTYPES.get(type(value))
+    if literal is None:
+        try:
+            literal = pl.Series([value]).dtype
+        except Exception:
+            return False
+        if literal.is_numeric() and dtype.is_numeric():
+            return True
+    return literal.base_type() == dtype.base_type()
+
+
+def _literal_value(node: Dict[str, Any], comparison: pl.Expr, operand: int) -> Any:
+    """
+    Valor Python de um literal. Inteiros, floats finitos, strings e booleanos sao
+    lidos direto da arvore serializada; os demais (datas, literais tipados, e
+    NaN/inf, que o JSON nao representa) sao avaliados a partir do operando
+    `operand` da expressao `comparison` (0: direito, 1: esquerdo, como em `meta.pop`).
+    """
+    literal = node["Literal"]
+    if isinstance(literal, dict) and len(literal) == 1:
+        ((family, payload),) = literal.items()
+        if isinstance(payload, dict) and len(payload) == 1:
+            ((kind, value),) = payload.items()
+            if family == "Dyn" and kind == "Int" and isinstance(value, int):
+                return value
+            if family == "Dyn" and kind == "Float" and isinstance(value, (int, float)):
+                return float(value)
+            if family == "Scalar" and kind == "String" and isinstance(value, str):
+                return value
+            if family == "Scalar" and kind == "Boolean" and isinstance(value, bool):
+                return value
+    return pl.select(comparison.meta.pop()[operand]).item()
+
+
+def _parse_comparison(node: Dict[str, Any], expr: pl.Expr) -> Optional[Tuple[str, str, Any]]:
+    """Reconhece `col <op> literal` (ou `literal <op> col`) e retorna (coluna, op, valor)."""
+    binary = node.get("BinaryExpr") if isinstance(node, dict) else None
+    if binary is None or binary["op"] not in _COMPARISON_OPS:
+        return None
+    left, right, op = binary["left"], binary["right"], binary["op"]
+    if "Column" in left and "Literal" in right:
+        return left["Column"], op, _literal_value(right, expr, 0)
+    if "Literal" in left and "Column" in right:
+        return right["Column"], _MIRRORED_OPS[op], _literal_value(left, expr, 1)
+    return None
+
+
+def _flatten_and(node: Dict[str, Any], expr: pl.Expr) -> List[Tuple[Dict[str, Any], pl.Expr]]:
+    binary = node.get("BinaryExpr") if isinstance(node, dict) else None
+    if binary is not None and binary["op"] == "And":
+        # `meta.pop` devolve os operandos na ordem (direito, esquerdo)
+        right, left = expr.meta.pop()
+        return _flatten_and(binary["left"], left) + _flatten_and(binary["right"], right)
+    return [(node, expr)]
+
+
+def parse_index_predicate(condition: pl.Expr) -> Optional[Tuple[str, str, Any, Any, bool, bool]]:
+    """
+    Traduz um predicado simples sobre uma unica coluna para uma consulta de indice.
+    Retorna (coluna, tipo, low, high, low_inclusive, high_inclusive), com tipo
+    "eq" ou "range", ou `None` se o predicado nao puder ser atendido por um indice
+    (inclusive quando a arvore ou o literal nao podem ser lidos).
+    """
+    try:
+        comparisons = []
+        for term, expr in _flatten_and(json.loads(condition.meta.serialize(format="json")), condition):
+            parsed = _parse_comparison(term, expr)
+            if parsed is None:
+                return None
+            comparisons.append(parsed)
+    except Exception:
+        return None
+
+    columns = {column for column, _, _ in comparisons}
+    if len(columns) != 1:
+        return None
+    if any(isinstance(value, float) and math.isnan(value) for _, _, value in comparisons):
+        # NaN e igual a NaN no filtro do Polars, mas nao nas buscas dos indices
+        return None
+    column = columns.pop()
+
+    if len(comparisons) == 1 and comparisons[0][1] == "Eq":
+        value = comparisons[0][2]
+        return column, "eq", value, value, True, True
+
+    low, high, low_inclusive, high_inclusive = None, None, True, True
+    for _, op, value in comparisons:
+        if value is None:
+            return None
+        if op == "Eq":
+            return None
+        if op in ("Gt", "GtEq"):
+            if low is None or value > low or (value == low and op == "Gt"):
+                low, low_inclusive = value, op == "GtEq"
+        else:
+            if high is None or value < high or (value == high and op == "Lt"):
+                high, high_inclusive = value, op == "LtEq"
+    return column, "range", low, high, low_inclusive, high_inclusive
+
+
+class IndexRegistry:
+    """
+    Mantem os indices construidos para cada DataFrame residente.
+
+    Os indices de um DataFrame sao descartados automaticamente quando ele e
+    coletado pelo GC ou quando sua forma/schema muda; o indice de uma coluna e
+    descartado quando os buffers da coluna mudam (ex.: `df[0, "col"] = x`,
+    `replace_column`), verificado pelos enderecos de memoria a cada consulta.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[weakref.ref, Tuple, Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _fingerprint(df: pl.DataFrame) -> Tuple:
+        return df.shape, tuple(df.columns), tuple(df.dtypes)
+
+    def _indexes_for(self, df: pl.DataFrame) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(id(df))
+        if entry is None:
+            return None
+        ref, fingerprint, indexes = entry
+        if ref() is not df or fingerprint != self._fingerprint(df):
+            del self._entries[id(df)]
+            return None
+        return indexes
+
+    def create_index(self, df: pl.DataFrame, column: str, kind: str = "hash"):
+        """Constroi (ou reconstroi) um indice `kind` ("hash" ou "sorted") sobre `column`."""
+        if kind not in _INDEX_TYPES:
+            raise ValueError(f"Tipo de indice desconhecido: {kind}")
+        series = df.get_column(column)
+        buffers = column_buffers(series)
+        if buffers is None:
+            raise TypeError(f"Coluna '{column}' de tipo {series.dtype} nao pode ser indexada")
+        index = _INDEX_TYPES[kind](series)
+
+        indexes = self._indexes_for(df)
+        if indexes is None:
+            key = id(df)
+            indexes = {}
+            ref = weakref.ref(df, lambda _, key=key: self._entries.pop(key, None))
+            self._entries[key] = (ref, self._fingerprint(df), indexes)
+        entry = indexes.get(column)
+        if entry is None or entry["buffers"] != buffers:
+            # A Series mantem os buffers originais vivos, de modo que seus
+            # enderecos nao podem ser reutilizados por uma coluna alterada
+            entry = indexes[column] = {"series": series, "buffers": buffers, "kinds": {}}
+        entry["kinds"][kind] = index
+        return index
+
+    def get_index(self, df: pl.DataFrame, column: str, kind: Optional[str] = None):
+        """Retorna um indice valido para `column` (preferindo `kind`), ou `None`."""
+        return self._valid_index(self._indexes_for(df), df, column, kind)
+
+    @staticmethod
+    def _valid_index(indexes: Optional[Dict[str, Any]], df: pl.DataFrame, column: str,
+                     kind: Optional[str]):
+        if indexes is None or column not in indexes:
+            return None
+        entry = indexes[column]
+        if column_buffers(df.get_column(column)) != entry["buffers"]:
+            del indexes[column]
+            return None
+        by_kind = entry["kinds"]
+        if kind is not None:
+            return by_kind.get(kind)
+        return by_kind.get("hash") or by_kind.get("sorted")
+
+    def invalidate(self, df: Optional[pl.DataFrame] = None):
+        """Descarta os indices de `df`, ou de todos os DataFrames se `df` for `None`."""
+        if df is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(id(df), None)
+
+    def filter(self, df: pl.DataFrame, condition: pl.Expr) -> Optional[pl.DataFrame]:
+        """
+        Atende `condition` via indice, se houver um aplicavel. Retorna `None`
+        quando o predicado nao corresponde a nenhuma coluna indexada ou quando o
+        literal nao tem o tipo da coluna (o filtro normal reporta o erro).
+        """
+        indexes = self._indexes_for(df)
+        if indexes is None:
+            return None
+        predicate = parse_index_predicate(condition)
+        if predicate is None:
+            return None
+        column, query, low, high, low_inclusive, high_inclusive = predicate
+        if column not in df.columns:
+            return None
+        dtype = df.get_column(column).dtype
+        if not all(_literal_matches(value, dtype) for value in (low, high)):
+            return None
+
+        index = self._valid_index(indexes, df, column, None if query == "eq" else "sorted")
+        if index is None:
+            return None
+        try:
+            if query == "range":
+                rows = index.positions(low, high, low_inclusive, high_inclusive)
+            elif low is None:
+                rows = []
+            elif index.kind == "sorted":
+                rows = index.positions(low, low)
+            else:
+                rows = index.lookup(low)
+        except (TypeError, pl.exceptions.PolarsError):
+            # Tipos incompativeis: deixa o filtro normal reportar o erro
+            return None
+        if len(rows) == 0:
+            return df.clear()
+        if len(rows) == 1:
+            return df.slice(rows[0], 1)
+        if isinstance(rows, list):
+            rows = pl.Series(rows, dtype=pl.get_index_type())
+        return df[rows]
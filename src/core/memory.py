@@ -0,0 +1,239 @@
+"""
+Polars High-Speed DataFrames
+Author: Gabriel Demetrios Lafis
+Year: 2025
+
+Contabilidade de memoria por chamada do processador. Cada chamada registra o
+`estimated_size()` das entradas e da saida e o pico de RSS observado durante a
+execucao. Com orcamentos por chamada e/ou por processo, chamadas cuja estimativa
+nao cabe na folga disponivel recebem uma politica antes de alocar qualquer coisa:
+
+- "fail": recusa com `MemoryBudgetExceeded`;
+- "stream": repassa `engine="streaming"` as operacoes que coletam um plano lazy
+  (parametro `engine`);
+- "spill": repassa o orcamento como `memory_budget` (execucao fora da memoria
+  com `OutOfCoreExecutor`); operacoes sem esse suporte caem em "stream";
+- "downsample": amostra os DataFrames de entrada ate a estimativa caber.
+
+Operacoes que nao suportam a politica escolhida sao recusadas com
+`MemoryBudgetExceeded`, e o relatorio so registra politicas de fato aplicadas.
+"""
+
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, NamedTuple, Optional
+
+import polars as pl
+
+POLICIES = ("fail", "stream", "spill", "downsample")
+
+# Memoria de trabalho estimada como multiplo do tamanho das entradas
+# (saida mais intermediarios de joins, agregacoes e ordenacoes)
+DEFAULT_EXPANSION = 2.0
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """A estimativa de memoria de uma chamada excede o orcamento configurado."""
+
+
+class MemoryReport(NamedTuple):
+    """Medicoes de uma chamada: bytes de entrada/saida, pico de RSS e politica aplicada."""
+    operation: str
+    input_bytes: int
+    output_bytes: int
+    estimated_bytes: int
+    peak_rss: int
+    rss_delta: int
+    policy: Optional[str]
+    sample_fraction: float
+    seconds: float
+
+
+def current_rss() -> int:
+    """
+    RSS atual do processo em bytes (`/proc/self/statm`, ou o pico historico de
+    `resource` como fallback; 0 onde nenhum dos dois existe, como no Windows).
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def estimated_bytes(value: Any) -> int:
+    """Soma de `estimated_size()` dos DataFrames/Series em `value` (LazyFrames contam zero)."""
+    if isinstance(value, (pl.DataFrame, pl.Series)):
+        return value.estimated_size()
+    if isinstance(value, dict):
+        return sum(estimated_bytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimated_bytes(item) for item in value)
+    return 0
+
+
+class _PeakSampler:
+    """Amostra o RSS numa thread enquanto a chamada executa e guarda o maior valor."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.peak = current_rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def __enter__(self) -> "_PeakSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+def _bind(fn: Callable, args: tuple, kwargs: dict) -> Optional[inspect.BoundArguments]:
+    """Associa os argumentos da chamada aos parametros de `fn` (None se nao for possivel)."""
+    try:
+        return inspect.signature(fn).bind_partial(*args, **kwargs)
+    except (TypeError, ValueError):
+        return None
+
+
+def _downsample(value: Any, fraction: float) -> Any:
+    if isinstance(value, pl.DataFrame):
+        return value.sample(fraction=fraction, seed=0) if value.height else value
+    if isinstance(value, dict):
+        return {key: _downsample(item, fraction) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_downsample(item, fraction) for item in value]
+    return value
+
+
+class MemoryGovernor:
+    """
+    Orcamentos de memoria e historico de `MemoryReport`s.
+
+    `call_budget` limita a memoria estimada de cada chamada; `process_budget`
+    limita o RSS do processo somado as reservas das chamadas em andamento (util
+    quando varias chamadas rodam em threads, como no servidor de consultas).
+    """
+
+    def __init__(self, call_budget: Optional[int] = None, process_budget: Optional[int] = None,
+                 policy: str = "fail", expansion: float = DEFAULT_EXPANSION,
+                 history: int = 100, sample_interval: float = DEFAULT_SAMPLE_INTERVAL):
+        if policy not in POLICIES:
+            raise ValueError(f"Politica desconhecida: {policy} (use uma de {POLICIES})")
+        self.call_budget = call_budget
+        self.process_budget = process_budget
+        self.policy = policy
+        self.expansion = expansion
+        self.sample_interval = sample_interval
+        self.reports: Deque[MemoryReport] = deque(maxlen=history)
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    def headroom(self) -> Optional[int]:
+        """Bytes que a proxima chamada pode usar (None quando nao ha orcamento)."""
+        limits = []
+        if self.call_budget is not None:
+            limits.append(self.call_budget)
+        if self.process_budget is not None:
+            with self._lock:
+                reserved = self._reserved
+            limits.append(max(self.process_budget - current_rss() - reserved, 0))
+        return min(limits) if limits else None
+
+    @property
+    def last_report(self) -> Optional[MemoryReport]:
+        return self.reports[-1] if self.reports else None
+
+    def run(self, operation: str, fn: Callable, *args, **kwargs) -> Any:
+        """Executa `fn(*args, **kwargs)` aplicando o orcamento e registra um `MemoryReport`."""
+        input_bytes = estimated_bytes(args) + estimated_bytes(kwargs)
+        estimate = int(input_bytes * self.expansion)
+        headroom = self.headroom()
+        policy, fraction = None, 1.0
+
+        if headroom is not None and estimate > headroom:
+            policy = self.policy
+            exceeded = (
+                f"{operation}: estimativa de {estimate:,} bytes (entradas: {input_bytes:,} bytes) "
+                f"excede a folga de {headroom:,} bytes do orcamento de memoria"
+            )
+            if policy == "fail":
+                raise MemoryBudgetExceeded(exceeded)
+            # Argumentos associados por nome, para que valores passados por
+            # posicao (ex.: `engine`) sejam substituidos e nao duplicados
+            bound = _bind(fn, args, kwargs)
+            parameters = bound.signature.parameters if bound is not None else {}
+            if policy == "spill":
+                if "memory_budget" in parameters:
+                    if bound.arguments.get("memory_budget") is None:
+                        bound.arguments["memory_budget"] = max(headroom, 1)
+                else:
+                    policy = "stream"
+            if policy == "stream":
+                if "engine" not in parameters:
+                    raise MemoryBudgetExceeded(
+                        f"{exceeded}, e a operacao nao suporta execucao em streaming nem fora da memoria"
+                    )
+                bound.arguments["engine"] = "streaming"
+            if bound is not None:
+                args, kwargs = bound.args, bound.kwargs
+            if policy == "downsample":
+                fraction = max(headroom, 1) / estimate
+                args = tuple(_downsample(arg, fraction) for arg in args)
+                kwargs = {key: _downsample(value, fraction) for key, value in kwargs.items()}
+                estimate = int((estimated_bytes(args) + estimated_bytes(kwargs)) * self.expansion)
+
+        reservation = min(estimate, headroom) if headroom is not None else estimate
+        with self._lock:
+            self._reserved += reservation
+        rss_before = current_rss()
+        start = time.perf_counter()
+        try:
+            with _PeakSampler(self.sample_interval) as sampler:
+                result = fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._reserved -= reservation
+
+        self.reports.append(MemoryReport(
+            operation=operation,
+            input_bytes=input_bytes,
+            output_bytes=estimated_bytes(result),
+            estimated_bytes=estimate,
+            peak_rss=sampler.peak,
+            rss_delta=max(sampler.peak - rss_before, 0),
+            policy=policy,
+            sample_fraction=fraction,
+            seconds=time.perf_counter() - start,
+        ))
+        return result
+
+
+def accounted(method: Callable) -> Callable:
+    """Decorador para metodos de processadores com atributo `memory` (um `MemoryGovernor` ou None)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        governor = getattr(self, "memory", None)
+        if governor is None:
+            return method(self, *args, **kwargs)
+        return governor.run(method.__name__, functools.partial(method, self), *args, **kwargs)
+    return wrapper
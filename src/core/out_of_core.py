@@ -0,0 +1,347 @@
+"""
+Polars High-Speed DataFrames
+Author: Gabriel Demetrios Lafis
+Year: 2025
+
+Execucao fora da memoria (out-of-core) para ordenacoes e joins maiores que a RAM.
+As particoes intermediarias sao gravadas como Arrow IPC num diretorio temporario
+local e processadas uma a uma, respeitando um orcamento de memoria:
+
+- ordenacao externa: os dados sao particionados por faixas da primeira chave
+  (limites escolhidos por amostragem), cada faixa e ordenada em memoria e as
+  faixas sao concatenadas em ordem. Faixas que nao cabem no orcamento (chaves
+  com poucos valores ou muito concentradas) sao reparticionadas recursivamente,
+  passando as chaves seguintes (e por fim a posicao original da linha) quando a
+  chave da vez e constante;
+- grace hash join: os dois lados sao particionados pelo hash da chave de join e
+  cada par de particoes e unido em memoria. Pares grandes demais sao
+  reparticionados com outra semente de hash; chaves "quentes" que continuam
+  grandes demais sao unidas em lotes contra o lado que cabe na memoria.
+
+Quando nenhuma dessas estrategias respeita o orcamento, `MemoryBudgetExceeded`
+e levantado em vez de carregar a particao inteira.
+"""
+
+import math
+import os
+import shutil
+import tempfile
+import polars as pl
+from typing import Callable, Iterator, List, Optional, Sequence, Union
+
+from .memory import MemoryBudgetExceeded
+
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+SAMPLE_ROWS = 1_000
+# Fracao do orcamento ocupada por cada lote lido; o restante cobre copias e saidas
+BATCH_BUDGET_FRACTION = 0.25
+# Niveis de reparticionamento por hash antes de recorrer ao join em lotes
+MAX_REPARTITION_DEPTH = 3
+
+_SORT_ROW = "__sort_row"
+_LEFT_ROW = "__left_row"
+_RIGHT_ROW = "__right_row"
+_JOIN_ORDER = "__join_order"
+
+
+def _row_bytes(data: Frame) -> float:
+    """Estimativa do tamanho em memoria de uma linha, a partir das primeiras linhas."""
+    sample = data.head(SAMPLE_ROWS)
+    if isinstance(sample, pl.LazyFrame):
+        sample = sample.collect()
+    if sample.height == 0:
+        return 1.0
+    return max(sample.estimated_size() / sample.height, 1.0)
+
+
+def _row_count(data: Frame) -> int:
+    if isinstance(data, pl.DataFrame):
+        return data.height
+    return data.select(pl.len()).collect().item()
+
+
+def _iter_batches(data: Frame, batch_rows: int) -> Iterator[pl.DataFrame]:
+    if isinstance(data, pl.DataFrame):
+        yield from data.iter_slices(batch_rows)
+    else:
+        for batch in data.collect_batches(chunk_size=batch_rows):
+            if batch.height:
+                yield batch
+
+
+def _hash_bucket(columns: Sequence[str], partitions: int, seed: int = 0) -> Callable[[pl.DataFrame], pl.Series]:
+    """Particionador por hash: linhas com os mesmos valores em `columns` vao para a mesma particao."""
+    def bucket(batch: pl.DataFrame) -> pl.Series:
+        return batch.select(
+            (pl.struct(columns).hash(seed=seed) % partitions).cast(pl.UInt32)
+        ).to_series()
+    return bucket
+
+
+def _files_bytes(files: List[str]) -> float:
+    """Tamanho estimado em memoria dos arquivos IPC `files` (linhas x bytes por linha)."""
+    lf = pl.scan_ipc(files)
+    return _row_bytes(lf) * _row_count(lf)
+
+
+def _range_splitters(sample: pl.Series, partitions: int) -> pl.Series:
+    """
+    Limites de faixa a partir de uma amostra ordenada. Um limite igual ao maior
+    valor amostrado nao separa nada e e descartado; com ao menos dois valores
+    distintos ha sempre um limite, para que o reparticionamento progrida.
+    """
+    if sample.len() == 0:
+        return sample
+    positions = [sample.len() * i // partitions for i in range(1, partitions)]
+    maximum = sample[-1]
+    splitters = sample.gather(positions).unique(maintain_order=True)
+    splitters = splitters.filter(splitters != maximum)
+    if splitters.len() == 0:
+        distinct = sample.unique(maintain_order=True)
+        if distinct.len() > 1:
+            splitters = distinct.slice(distinct.len() // 2 - 1, 1)
+    return splitters
+
+
+class OutOfCoreExecutor:
+    """
+    Executa ordenacoes e joins com memoria limitada a `memory_budget` bytes,
+    despejando particoes em `spill_dir` (por padrao, o diretorio temporario do sistema).
+
+    Os resultados sao LazyFrames sobre arquivos IPC do diretorio de spill; devem
+    ser coletados ou gravados (`sink_parquet`) antes de `close()`. Use como
+    gerenciador de contexto para remover os arquivos ao final.
+    """
+
+    def __init__(self, memory_budget: int, spill_dir: Optional[str] = None):
+        if memory_budget <= 0:
+            raise ValueError("memory_budget deve ser positivo")
+        self.memory_budget = memory_budget
+        self.work_dir = tempfile.mkdtemp(prefix="polars-spill-", dir=spill_dir)
+        self._files = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Remove todos os arquivos de spill."""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _batch_rows(self, row_bytes: float) -> int:
+        return max(int(self.memory_budget * BATCH_BUDGET_FRACTION / row_bytes), 1)
+
+    def _spill(self, df: pl.DataFrame, area: str) -> str:
+        directory = os.path.join(self.work_dir, area)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self._files:08d}.ipc")
+        self._files += 1
+        df.write_ipc(path)
+        return path
+
+    def _partition(self, data: Frame, bucket: Callable[[pl.DataFrame], pl.Series],
+                   partitions: int, area: str) -> List[List[str]]:
+        """
+        Le `data` em lotes e grava cada lote dividido por `bucket` em arquivos IPC.
+        Toda particao recebe ao menos um arquivo (vazio), preservando o schema.
+        """
+        files: List[List[str]] = [[] for _ in range(partitions)]
+        empty = None
+        for batch in _iter_batches(data, self._batch_rows(_row_bytes(data))):
+            empty = batch.clear()
+            parts = batch.with_columns(bucket(batch).alias("__bucket")).partition_by(
+                "__bucket", as_dict=True, include_key=False
+            )
+            for (index,), part in parts.items():
+                files[index].append(self._spill(part, area))
+        if empty is None:
+            empty = data.clear() if isinstance(data, pl.DataFrame) else data.clear().collect()
+        for index in range(partitions):
+            if not files[index]:
+                files[index].append(self._spill(empty, area))
+        return files
+
+    def sort(self, data: Frame, by: Union[str, Sequence[str]], descending: Union[bool, Sequence[bool]] = False,
+             transform: Optional[Callable[[pl.DataFrame], pl.DataFrame]] = None) -> pl.LazyFrame:
+        """
+        Ordenacao externa (estavel) de `data` por `by`. Linhas com o mesmo valor da
+        primeira chave caem sempre na mesma particao; assim `transform`, se
+        informado, pode aplicar funcoes de janela `.over(by[0])` a cada particao
+        ordenada. Com `transform`, cada valor da primeira chave precisa caber no
+        orcamento; senao, `MemoryBudgetExceeded` e levantado.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        descending = [descending] * len(by) if isinstance(descending, bool) else list(descending)
+        indexed = data.lazy().with_row_index(_SORT_ROW)
+        keys, key_descending = by + [_SORT_ROW], descending + [False]
+        return pl.scan_ipc(self._sort_files(indexed, keys, key_descending, transform, level=0))
+
+    def _sort_files(self, data: pl.LazyFrame, keys: List[str], descending: List[bool],
+                    transform: Optional[Callable[[pl.DataFrame], pl.DataFrame]], level: int) -> List[str]:
+        """
+        Ordena `data` por `keys` (a ultima e `_SORT_ROW`, unica) particionando por
+        faixas de `keys[level]` e retorna os arquivos de saida em ordem. Particoes
+        grandes demais sao reparticionadas recursivamente; quando a coluna da vez
+        e constante na particao, passa-se a chave seguinte.
+        """
+        def finish(df: pl.DataFrame) -> str:
+            df = df.sort(keys, descending=descending).drop(_SORT_ROW)
+            if transform is not None:
+                df = transform(df)
+            return self._spill(df, "sorted")
+
+        row_bytes = _row_bytes(data)
+        total_bytes = row_bytes * _row_count(data)
+        if total_bytes <= self.memory_budget:
+            return [finish(data.collect())]
+
+        column = keys[level]
+        stats = data.select(
+            pl.col(column).n_unique().alias("distinct"), pl.col(column).min().alias("min"),
+            (pl.col(column).min() < pl.col(column).max()).alias("spread"),
+        ).collect()
+        if stats["distinct"].item() <= 1:
+            if transform is not None:
+                value = stats["min"].item()
+                raise MemoryBudgetExceeded(
+                    f"sort: as linhas com {column}={value!r} ocupam ~{int(total_bytes):,} bytes e nao cabem "
+                    f"no orcamento de {self.memory_budget:,} bytes; a transformacao precisa do grupo inteiro em memoria"
+                )
+            return self._sort_files(data, keys, descending, transform, level + 1)
+
+        # Particoes com metade do orcamento cada, deixando espaco para a ordenacao
+        partitions = max(math.ceil(total_bytes * 2 / self.memory_budget), 2)
+        samples = []
+        for batch in _iter_batches(data, self._batch_rows(row_bytes)):
+            values = batch.get_column(column).drop_nulls()
+            samples.append(values.sample(min(SAMPLE_ROWS, values.len()), seed=0))
+        splitters = _range_splitters(pl.concat(samples).sort(), partitions)
+        if splitters.len() == 0 and stats["spread"].item():
+            # Valores raros fora da amostra: separa o minimo do restante
+            splitters = stats["min"]
+
+        # Faixas 0..S para valores e S+1 para nulos, que vem primeiro em ambas as direcoes
+        null_bucket = splitters.len() + 1
+
+        def bucket(batch: pl.DataFrame) -> pl.Series:
+            values = batch.get_column(column)
+            index = splitters.search_sorted(values, side="right") if splitters.len() else pl.Series([0] * batch.height)
+            return pl.select(
+                pl.when(values.is_null()).then(null_bucket).otherwise(index).cast(pl.UInt32)
+            ).to_series()
+
+        files = self._partition(data, bucket, null_bucket + 1, "sort-input")
+        ranges = range(null_bucket - 1, -1, -1) if descending[level] else range(null_bucket)
+        outputs = []
+        for index in [null_bucket, *ranges]:
+            if _files_bytes(files[index]) <= self.memory_budget:
+                outputs.append(finish(pl.concat([pl.read_ipc(path) for path in files[index]])))
+            else:
+                outputs.extend(self._sort_files(pl.scan_ipc(files[index]), keys, descending, transform, level))
+            for path in files[index]:
+                os.remove(path)
+        return outputs
+
+    def join(self, left: Frame, right: Frame, on: Union[str, Sequence[str]], how: str = "inner",
+             **kwargs) -> pl.LazyFrame:
+        """
+        Grace hash join: particiona os dois lados pelo hash de `on` e une cada par
+        de particoes em memoria. Produz as mesmas linhas, na mesma ordem, que
+        `left.join(right, ..., maintain_order="left_right")` ("right_left" para `how="right"`).
+        """
+        if how == "cross":
+            raise ValueError("Join cruzado nao e suportado fora da memoria")
+        on = [on] if isinstance(on, str) else list(on)
+        left_rows = _row_count(left)
+        left_lf = left.lazy().with_row_index(_LEFT_ROW)
+        right_lf = right.lazy().with_row_index(_RIGHT_ROW)
+        joined = pl.scan_ipc(self._grace_join(left_lf, right_lf, on, how, kwargs, depth=0))
+
+        # Restaura a ordem do join em memoria com uma ordenacao externa pelos indices de linha
+        if how in ("semi", "anti"):
+            return self.sort(joined, _LEFT_ROW).drop(_LEFT_ROW)
+        if how == "right":
+            order = [pl.col(_RIGHT_ROW).alias(_JOIN_ORDER), _LEFT_ROW]
+        else:
+            # Linhas so da direita (join "full") vem depois de todas as da esquerda
+            order = [
+                pl.coalesce(_LEFT_ROW, pl.col(_RIGHT_ROW) + left_rows).alias(_JOIN_ORDER), _RIGHT_ROW
+            ]
+        ordered = joined.with_columns(order[0])
+        return self.sort(ordered, [_JOIN_ORDER, order[1]]).drop(_JOIN_ORDER, _LEFT_ROW, _RIGHT_ROW)
+
+    def _grace_join(self, left: pl.LazyFrame, right: pl.LazyFrame, on: List[str], how: str,
+                    kwargs: dict, depth: int) -> List[str]:
+        total_bytes = _row_bytes(left) * _row_count(left) + _row_bytes(right) * _row_count(right)
+        if total_bytes <= self.memory_budget:
+            return [self._spill(left.join(right, on=on, how=how, **kwargs).collect(), "joined")]
+
+        partitions = max(math.ceil(total_bytes * 2 / self.memory_budget), 2)
+        # Cada nivel usa outra semente, redistribuindo as chaves de um par grande demais
+        bucket = _hash_bucket(on, partitions, seed=depth)
+        left_files = self._partition(left, bucket, partitions, "join-left")
+        right_files = self._partition(right, bucket, partitions, "join-right")
+        outputs = []
+        for index in range(partitions):
+            left_part, right_part = pl.scan_ipc(left_files[index]), pl.scan_ipc(right_files[index])
+            left_bytes, right_bytes = _files_bytes(left_files[index]), _files_bytes(right_files[index])
+            if left_bytes + right_bytes <= self.memory_budget:
+                joined = left_part.join(right_part, on=on, how=how, **kwargs).collect()
+                outputs.append(self._spill(joined, "joined"))
+            elif depth < MAX_REPARTITION_DEPTH:
+                outputs.extend(self._grace_join(left_part, right_part, on, how, kwargs, depth + 1))
+            else:
+                outputs.extend(self._chunked_join(left_part, right_part, left_bytes, right_bytes, on, how, kwargs))
+            for path in left_files[index] + right_files[index]:
+                os.remove(path)
+        return outputs
+
+    def _chunked_join(self, left: pl.LazyFrame, right: pl.LazyFrame, left_bytes: float, right_bytes: float,
+                      on: List[str], how: str, kwargs: dict) -> List[str]:
+        """
+        Join de chaves quentes: o lado que cabe em metade do orcamento fica em
+        memoria e o outro e lido em lotes. Cada linha do lado em lotes depende so
+        do lado em memoria, o que vale para os joins "inner", "left", "semi" e
+        "anti" (esquerda em lotes) e "inner" e "right" (direita em lotes).
+        """
+        half = self.memory_budget / 2
+        outputs = []
+        if right_bytes <= half and how in ("inner", "left", "semi", "anti"):
+            right_df = right.collect()
+            for batch in _iter_batches(left, self._batch_rows(_row_bytes(left))):
+                outputs.append(self._spill(batch.join(right_df, on=on, how=how, **kwargs), "joined"))
+        elif left_bytes <= half and how in ("inner", "right"):
+            left_df = left.collect()
+            for batch in _iter_batches(right, self._batch_rows(_row_bytes(right))):
+                outputs.append(self._spill(left_df.join(batch, on=on, how=how, **kwargs), "joined"))
+        else:
+            raise MemoryBudgetExceeded(
+                f"join: as linhas das chaves mais frequentes de {on} ocupam ~{int(left_bytes):,} + "
+                f"~{int(right_bytes):,} bytes e nao cabem no orcamento de {self.memory_budget:,} bytes "
+                f"(how={how!r})"
+            )
+        return outputs
+
+    def unique(self, data: Frame, subset: Optional[Sequence[str]] = None, keep: str = "first") -> pl.LazyFrame:
+        """
+        Remove duplicatas fora da memoria: particiona por hash de `subset` (ou de
+        todas as colunas), deduplica cada particao e restaura a ordem original
+        com uma ordenacao externa pelo numero da linha.
+        """
+        lf = data.lazy()
+        columns = lf.collect_schema().names()
+        subset = list(subset) if subset is not None else columns
+        indexed = lf.with_row_index("__row")
+        partitions = max(math.ceil(_row_bytes(data) * _row_count(data) * 2 / self.memory_budget), 1)
+
+        files = self._partition(indexed, _hash_bucket(subset, partitions), partitions, "unique-input")
+        outputs = []
+        for index in range(partitions):
+            part = pl.scan_ipc(files[index]).unique(subset, keep=keep, maintain_order=True).collect()
+            outputs.append(self._spill(part, "unique"))
+            for path in files[index]:
+                os.remove(path)
+        return self.sort(pl.scan_ipc(outputs), "__row").drop("__row")
@@ -0,0 +1,213 @@
+"""
+Polars High-Speed DataFrames
+Author: Gabriel Demetrios Lafis
+Year: 2025
+
+Ajuste automatico de compressao e layout na escrita de Parquet. Uma amostra do
+DataFrame e gravada em memoria com cada codec/nivel candidato (zstd, lz4, snappy)
+e o vencedor e escolhido segundo o objetivo: menor arquivo ("smallest"), leitura
+mais rapida ("fastest_read") ou equilibrio entre os dois ("balanced").
+O tamanho dos row groups nao e medido: segue um alvo fixo de bytes por objetivo
+(`ROW_GROUP_TARGET_BYTES`). As escolhas de codificacao por coluna sao aplicadas
+quando o pyarrow esta instalado.
+"""
+
+import io
+import json
+import os
+import time
+import polars as pl
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+OBJECTIVES = ("smallest", "fastest_read", "balanced")
+
+DEFAULT_CANDIDATES: List[Tuple[str, Optional[int]]] = [
+    ("zstd", 1), ("zstd", 3), ("zstd", 9), ("lz4", None), ("snappy", None),
+]
+
+# Alvo de bytes (em memoria) por row group: grupos menores paralelizam melhor
+# a leitura; grupos maiores comprimem melhor e reduzem metadados
+ROW_GROUP_TARGET_BYTES = {
+    "smallest": 256 << 20,
+    "fastest_read": 32 << 20,
+    "balanced": 128 << 20,
+}
+MIN_ROW_GROUP_ROWS = 10_000
+
+# Fracao distinta abaixo da qual uma coluna e codificada com dicionario
+DICTIONARY_MAX_DISTINCT_RATIO = 0.5
+
+METADATA_KEY = "polars_demo.tuning"
+
+
+class ParquetTuningReport(NamedTuple):
+    """Escolhas feitas pelo escritor ajustado e medicoes dos candidatos."""
+    objective: str
+    compression: str
+    compression_level: Optional[int]
+    row_group_size: int
+    row_group_target_bytes: int
+    column_encodings: Dict[str, str]
+    encodings_applied: bool
+    sorted_by: List[str]
+    candidates: List[Dict[str, Any]]
+    file_size: int
+
+
+def _benchmark(sample: pl.DataFrame, compression: str, level: Optional[int],
+               repeats: int) -> Dict[str, Any]:
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    sample.write_parquet(buffer, compression=compression, compression_level=level)
+    write_seconds = time.perf_counter() - start
+    size = buffer.tell()
+
+    read_seconds = float("inf")
+    for _ in range(repeats):
+        buffer.seek(0)
+        start = time.perf_counter()
+        pl.read_parquet(buffer)
+        read_seconds = min(read_seconds, time.perf_counter() - start)
+    return {
+        "compression": compression,
+        "compression_level": level,
+        "size": size,
+        "write_seconds": write_seconds,
+        "read_seconds": read_seconds,
+    }
+
+
+def _score(result: Dict[str, Any], best: Dict[str, float], objective: str) -> float:
+    size = result["size"] / best["size"]
+    read = result["read_seconds"] / best["read_seconds"]
+    if objective == "smallest":
+        return size + read * 1e-3  # desempate pela leitura
+    if objective == "fastest_read":
+        return read + size * 1e-3
+    return size + read
+
+
+def choose_column_encodings(sample: pl.DataFrame) -> Dict[str, str]:
+    """
+    Codificacao sugerida por coluna: RLE para booleanos, dicionario para baixa
+    cardinalidade, DELTA_BINARY_PACKED para inteiros ordenados e PLAIN para o restante.
+    """
+    encodings = {}
+    for series in sample.iter_columns():
+        if series.dtype == pl.Boolean:
+            encodings[series.name] = "RLE"
+        elif sample.height and series.n_unique() / sample.height <= DICTIONARY_MAX_DISTINCT_RATIO:
+            encodings[series.name] = "DICTIONARY"
+        elif series.dtype.is_integer() and series.is_sorted():
+            encodings[series.name] = "DELTA_BINARY_PACKED"
+        else:
+            encodings[series.name] = "PLAIN"
+    return encodings
+
+
+def _pyarrow_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _write_with_pyarrow(df: pl.DataFrame, file_path: str, encodings: Dict[str, str],
+                        metadata: Dict[str, str], compression: str, compression_level: Optional[int],
+                        row_group_size: int):
+    """
+    Grava com o pyarrow para aplicar as codificacoes por coluna (o escritor
+    pyarrow do Polars nao aceita metadados nem estatisticas completas). Os
+    metadados vao no schema Arrow, que vira chave-valor no rodape do Parquet.
+    """
+    import pyarrow.parquet as pq
+
+    table = df.to_arrow(compat_level=pl.CompatLevel.oldest())
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata.update({key.encode(): value.encode() for key, value in metadata.items()})
+    pq.write_table(
+        table.replace_schema_metadata(schema_metadata),
+        file_path,
+        compression=compression,
+        compression_level=compression_level,
+        row_group_size=row_group_size,
+        write_statistics=True,
+        use_dictionary=[name for name, encoding in encodings.items() if encoding == "DICTIONARY"],
+        column_encoding={name: encoding for name, encoding in encodings.items() if encoding != "DICTIONARY"},
+    )
+
+
+def write_parquet_tuned(df: pl.DataFrame, file_path: str, objective: str = "balanced",
+                        sort_by: Optional[Sequence[str]] = None, sample_rows: int = 100_000,
+                        candidates: Optional[List[Tuple[str, Optional[int]]]] = None,
+                        repeats: int = 3) -> ParquetTuningReport:
+    """
+    Grava `df` em `file_path` com codec, nivel e row group escolhidos para `objective`.
+    Com `sort_by`, os dados sao ordenados antes da escrita (melhora a compressao e
+    o descarte de row groups por estatisticas) e a ordem e registrada nos metadados
+    (chave `METADATA_KEY`). Codec e nivel sao medidos numa amostra; o row group
+    deriva do alvo de bytes do objetivo, sem medicao. Retorna um `ParquetTuningReport`.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Objetivo desconhecido: {objective} (use um de {OBJECTIVES})")
+    sorted_by = list(sort_by or [])
+    if sorted_by:
+        df = df.sort(sorted_by)
+
+    sample = df.sample(sample_rows, seed=0) if df.height > sample_rows else df
+    if sorted_by:
+        sample = sample.sort(sorted_by)
+    results = [
+        _benchmark(sample, compression, level, repeats)
+        for compression, level in (candidates or DEFAULT_CANDIDATES)
+    ]
+    best = {
+        "size": max(min(r["size"] for r in results), 1),
+        "read_seconds": max(min(r["read_seconds"] for r in results), 1e-9),
+    }
+    for result in results:
+        result["score"] = _score(result, best, objective)
+    chosen = min(results, key=lambda r: r["score"])
+
+    row_bytes = max(sample.estimated_size() / max(sample.height, 1), 1.0)
+    row_group_target_bytes = ROW_GROUP_TARGET_BYTES[objective]
+    row_group_size = max(int(row_group_target_bytes / row_bytes), MIN_ROW_GROUP_ROWS)
+    row_group_size = min(row_group_size, max(df.height, 1))
+
+    encodings = choose_column_encodings(sample)
+    encodings_applied = _pyarrow_available()
+    metadata = {
+        METADATA_KEY: json.dumps({
+            "objective": objective,
+            "compression": chosen["compression"],
+            "compression_level": chosen["compression_level"],
+            "row_group_size": row_group_size,
+            "sorted_by": sorted_by,
+        })
+    }
+    if encodings_applied:
+        _write_with_pyarrow(df, file_path, encodings, metadata, chosen["compression"],
+                            chosen["compression_level"], row_group_size)
+    else:
+        df.write_parquet(
+            file_path,
+            compression=chosen["compression"],
+            compression_level=chosen["compression_level"],
+            row_group_size=row_group_size,
+            statistics="full",
+            metadata=metadata,
+        )
+
+    return ParquetTuningReport(
+        objective=objective,
+        compression=chosen["compression"],
+        compression_level=chosen["compression_level"],
+        row_group_size=row_group_size,
+        row_group_target_bytes=row_group_target_bytes,
+        column_encodings=encodings,
+        encodings_applied=encodings_applied,
+        sorted_by=sorted_by,
+        candidates=results,
+        file_size=os.path.getsize(file_path),
+    )
@@ -9,14 +9,66 @@ com funcionalidades aprimoradas para leitura/escrita de arquivos, transformaçõ
 e uso de expressões avançadas.
 """
 
+from __future__ import annotations
+
+import os
 import polars as pl
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Any, Iterator, List, Optional, Union
+
+from . import batching
+from .memory import MemoryGovernor, accounted
+
+if TYPE_CHECKING:
+    from .indexing import IndexRegistry
+    from .parquet_tuning import ParquetTuningReport
+    from .schema_inference import SchemaInferenceService
+    from .snapshot_diff import SnapshotDiff
+    from .udf import UDF, UDFRegistry
+
+# Os demais submodulos (indices, execucao fora da memoria, Parquet ajustado,
+# snapshots, series temporais, UDFs) sao importados no primeiro uso, de modo que
+# jobs curtos pagam so pelo import do Polars
+
+
+def _default_engine(data: Union[pl.DataFrame, pl.LazyFrame]) -> str:
+    # LazyFrames (em geral arquivos escaneados) sao coletados em streaming
+    return "streaming" if isinstance(data, pl.LazyFrame) else "auto"
+
 
 class PolarsDataProcessor:
     """
     Classe para demonstrar operações de processamento de dados com Polars.
     """
 
+    def __init__(self, schema_cache_dir: Optional[str] = None, memory: Optional[MemoryGovernor] = None):
+        self._schema_cache_dir = schema_cache_dir
+        self._index_registry: Optional[IndexRegistry] = None
+        self._schema_service: Optional[SchemaInferenceService] = None
+        self._udf_registry: Optional[UDFRegistry] = None
+        # Orcamento e relatorios de memoria por chamada (ver core.memory)
+        self.memory = memory
+
+    @property
+    def _indexes(self) -> IndexRegistry:
+        if self._index_registry is None:
+            from .indexing import IndexRegistry
+            self._index_registry = IndexRegistry()
+        return self._index_registry
+
+    @property
+    def _schemas(self) -> SchemaInferenceService:
+        if self._schema_service is None:
+            from .schema_inference import SchemaInferenceService
+            self._schema_service = SchemaInferenceService(cache_dir=self._schema_cache_dir)
+        return self._schema_service
+
+    @property
+    def _udfs(self) -> UDFRegistry:
+        if self._udf_registry is None:
+            from .udf import UDFRegistry
+            self._udf_registry = UDFRegistry()
+        return self._udf_registry
+
     def load_data_from_dict(self, data: Dict[str, Any]) -> pl.DataFrame:
         """Carrega dados de um dicionário para um DataFrame Polars."""
         return pl.DataFrame(data)
@@ -25,6 +77,38 @@ class PolarsDataProcessor:
         """Lê dados de um arquivo CSV para um DataFrame Polars."""
         return pl.read_csv(file_path, **kwargs)
 
+    def read_csv_fast(self, file_path: str, known_clean: bool = False,
+                      refresh_schema: bool = False, **kwargs) -> pl.DataFrame:
+        """
+        Le um CSV com schema explicito, sem custo de inferencia quando o schema do
+        arquivo ja esta em cache. Sem cache, o schema e inferido por amostragem
+        (inicio, meio e fim do arquivo) e persistido para as proximas leituras.
+
+        `known_clean=True` pula a amostragem para arquivos confiaveis: a inferencia
+        padrao do Polars sobre as primeiras linhas e usada e o schema resultante
+        da leitura completa e guardado no cache. O parsing usa o pool de threads
+        do Polars (dimensionado por `POLARS_MAX_THREADS`); `low_memory=False` mantem
+        o parsing paralelo em blocos.
+
+        Se um valor fora da amostra nao couber no schema (amostrado ou em cache),
+        o arquivo e relido com inferencia completa (`infer_schema_length=None`) e
+        o cache e sobrescrito com o schema corrigido.
+        """
+        kwargs.setdefault("low_memory", False)
+        schema = None if refresh_schema else self._schemas.load_cached(file_path, **kwargs)
+        try:
+            if schema is None and known_clean:
+                df = pl.read_csv(file_path, **kwargs)
+                self._schemas.store(file_path, df.schema, **kwargs)
+                return df
+            if schema is None:
+                schema = self._schemas.get_schema(file_path, refresh=refresh_schema, **kwargs)
+            return pl.read_csv(file_path, schema=schema, **kwargs)
+        except pl.exceptions.ComputeError:
+            df = pl.read_csv(file_path, infer_schema_length=None, **kwargs)
+            self._schemas.store(file_path, df.schema, **kwargs)
+            return df
+
     def write_csv(self, df: pl.DataFrame, file_path: str, **kwargs):
         """Escreve um DataFrame Polars para um arquivo CSV."""
         df.write_csv(file_path, **kwargs)
@@ -37,50 +121,234 @@ class PolarsDataProcessor:
         """Escreve um DataFrame Polars para um arquivo Parquet."""
         df.write_parquet(file_path, **kwargs)
 
-    def filter_by_condition(self, df: pl.DataFrame, condition: pl.Expr) -> pl.DataFrame:
-        """Filtra o DataFrame usando uma expressão Polars."""
-        return df.filter(condition)
+    def write_parquet_tuned(self, df: pl.DataFrame, file_path: str, objective: str = "balanced",
+                            sort_by: Optional[List[str]] = None, **kwargs) -> ParquetTuningReport:
+        """
+        Escreve um Parquet com compressao, nivel e row group escolhidos por benchmark
+        sobre uma amostra, segundo `objective` ("smallest", "fastest_read" ou
+        "balanced"). Retorna um relatorio com as escolhas e as medicoes.
+        """
+        from .parquet_tuning import write_parquet_tuned
+        return write_parquet_tuned(df, file_path, objective, sort_by, **kwargs)
+
+    def read_csv_batches(self, file_path: str, batch_size: Optional[int] = None,
+                         memory_fraction: float = batching.DEFAULT_MEMORY_FRACTION,
+                         **kwargs) -> Iterator[pl.DataFrame]:
+        """
+        Le um CSV em lotes de `batch_size` linhas, um lote por vez.
+        Sem `batch_size`, o tamanho e ajustado para ocupar ate `memory_fraction`
+        da memoria disponivel.
+        """
+        return batching.iter_csv_batches(file_path, batch_size, memory_fraction, **kwargs)
+
+    def write_batches_to_dataset(self, batches: Iterator[pl.DataFrame], dataset_dir: str,
+                                 transform: Optional[Callable[[pl.DataFrame], pl.DataFrame]] = None,
+                                 **kwargs) -> List[str]:
+        """
+        Escreve lotes incrementalmente como partes Parquet de um dataset, aplicando
+        `transform` (ex.: metodos deste processador) a cada lote.
+        """
+        return batching.write_batches_to_dataset(batches, dataset_dir, transform, **kwargs)
+
+    def sink_csv_to_parquet(self, csv_path: str, parquet_path: str,
+                            transform: Optional[Callable[[pl.LazyFrame], pl.LazyFrame]] = None,
+                            csv_options: Optional[dict] = None, **kwargs):
+        """Converte CSV em Parquet em streaming via `sink_parquet`."""
+        batching.sink_csv_to_parquet(csv_path, parquet_path, transform, csv_options, **kwargs)
+
+    def scan_file(self, file_path: str, **kwargs) -> pl.LazyFrame:
+        """
+        Abre um arquivo CSV, Parquet ou IPC como LazyFrame, escolhendo o leitor
+        pela extensao. Nada e lido ate o plano ser coletado.
+        """
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext == ".csv":
+            return pl.scan_csv(file_path, **kwargs)
+        if ext == ".parquet":
+            return pl.scan_parquet(file_path, **kwargs)
+        if ext in (".ipc", ".arrow", ".feather"):
+            return pl.scan_ipc(file_path, **kwargs)
+        raise ValueError(f"Formato de arquivo nao suportado: {file_path}")
+
+    def create_index(self, df: pl.DataFrame, column: str, kind: str = "hash"):
+        """
+        Cria um indice secundario sobre `column` para acelerar `filter_by_condition`
+        repetidos sobre o mesmo DataFrame. `kind="hash"` atende igualdades em O(1);
+        `kind="sorted"` atende igualdades e intervalos (<, <=, >, >=) em O(log n).
+        """
+        return self._indexes.create_index(df, column, kind=kind)
+
+    def drop_indexes(self, df: Optional[pl.DataFrame] = None):
+        """Descarta os indices de `df` (ou todos). Necessario apos mutacoes in-place."""
+        if self._index_registry is not None:
+            self._index_registry.invalidate(df)
 
-    def calculate_summary_statistics(self, df: pl.DataFrame, group_col: str, agg_col: str) -> pl.DataFrame:
+    @accounted
+    def filter_by_condition(self, df: pl.DataFrame, condition: pl.Expr, engine: str = "auto") -> pl.DataFrame:
+        """
+        Filtra o DataFrame usando uma expressão Polars.
+        Se a expressao for uma comparacao simples sobre uma coluna indexada
+        (ver `create_index`), usa o indice em vez de varrer o DataFrame.
+        `engine` e repassado ao `collect` do plano lazy ("streaming", "in-memory"...).
+        """
+        if self._index_registry is not None:
+            indexed = self._index_registry.filter(df, condition)
+            if indexed is not None:
+                return indexed
+        return df.lazy().filter(condition).collect(engine=engine)
+
+    @accounted
+    def calculate_summary_statistics(self, df: pl.DataFrame, group_col: str, agg_col: str,
+                                     engine: str = "auto") -> pl.DataFrame:
         """
         Calcula estatísticas de resumo (média, mediana, min, max, desvio padrão)
-        agrupadas por uma coluna.
+        agrupadas por uma coluna, coletando o plano lazy com `engine`.
         """
-        return df.group_by(group_col).agg(
+        return df.lazy().group_by(group_col).agg(
             pl.col(agg_col).mean().alias(f"mean_{agg_col}"),
             pl.col(agg_col).median().alias(f"median_{agg_col}"),
             pl.col(agg_col).min().alias(f"min_{agg_col}"),
             pl.col(agg_col).max().alias(f"max_{agg_col}"),
             pl.col(agg_col).std().alias(f"std_{agg_col}"),
             pl.len().alias("count")
-        ).sort(group_col)
+        ).sort(group_col).collect(engine=engine)
 
-    def add_derived_columns(self, df: pl.DataFrame) -> pl.DataFrame:
+    @accounted
+    def add_derived_columns(self, df: pl.DataFrame, engine: str = "auto") -> pl.DataFrame:
         """
         Adiciona colunas derivadas usando expressões Polars, como:
         - `full_name`: Concatenação de nome e sobrenome.
         - `age_group`: Categorização da idade.
         - `salary_per_year`: Salário anual (se houver salário mensal).
+        O plano lazy e coletado com `engine`.
         """
-        return df.with_columns(
+        return df.lazy().with_columns(
             (pl.col("first_name") + pl.lit(" ") + pl.col("last_name")).alias("full_name"),
             pl.when(pl.col("age") < 30).then(pl.lit("Young"))
             .when(pl.col("age") < 50).then(pl.lit("Adult"))
             .otherwise(pl.lit("Senior")).alias("age_group"),
             (pl.col("monthly_salary") * 12).fill_null(0).alias("annual_salary")
-        )
+        ).collect(engine=engine)
+
+    def register_udf(self, name: str, function: Callable, return_dtype: pl.DataType,
+                     kind: str = "series", jit: bool = False, elementwise: bool = False) -> UDF:
+        """
+        Registra uma UDF em lote: `kind="series"` recebe Series, `kind="numpy"`
+        recebe arrays NumPy (compilada com Numba se `jit=True` e disponivel).
+        UDFs `kind="row"` rodam linha a linha e sao verificadas por um lint que
+        avisa quando uma expressao nativa faria o mesmo. `elementwise=True`
+        declara que cada linha de saida depende so da linha de entrada.
+        """
+        return self._udfs.register(name, function, return_dtype, kind=kind, jit=jit,
+                                   elementwise=elementwise)
+
+    def udf(self, name: str, *columns: str, alias: Optional[str] = None) -> pl.Expr:
+        """Expressao (`map_batches` com tipo declarado) que aplica a UDF `name` a `columns`."""
+        return self._udfs.expr(name, *columns, alias=alias)
+
+    @accounted
+    def apply_udf(self, df: pl.DataFrame, name: str, columns: Union[str, List[str]],
+                  alias: Optional[str] = None) -> pl.DataFrame:
+        """Adiciona a `df` a coluna calculada pela UDF `name` (nome de saida: `alias` ou `name`)."""
+        columns = [columns] if isinstance(columns, str) else columns
+        return self._udfs.apply(df, name, columns, alias=alias)
 
-    def apply_window_function(self, df: pl.DataFrame, partition_col: str, order_col: str, target_col: str) -> pl.DataFrame:
+    @accounted
+    def apply_window_function(self, df: pl.DataFrame, partition_col: str, order_col: str, target_col: str,
+                              memory_budget: Optional[int] = None, spill_dir: Optional[str] = None) -> pl.DataFrame:
         """
         Aplica uma funcao de janela (media movel, rank) a um DataFrame.
         Ordena por partition_col e order_col ANTES de aplicar rolling_mean
-        para garantir resultados deterministicos.
+        para garantir resultados deterministicos; a ordenacao e estavel, entao
+        empates em order_col mantem a ordem original (como no caminho fora da memoria).
+
+        Com `memory_budget` (bytes), a ordenacao e feita fora da memoria: os dados
+        sao particionados por faixas de `partition_col` em `spill_dir` e as janelas
+        sao calculadas particao a particao. Cada valor de `partition_col` precisa
+        caber no orcamento (senao, `MemoryBudgetExceeded`).
         """
-        return df.sort(partition_col, order_col).with_columns(
+        windows = [
             pl.col(target_col).rolling_mean(window_size=2).over(partition_col).alias(f"rolling_mean_{target_col}"),
             pl.col(target_col).rank().over(partition_col).alias(f"rank_{target_col}")
+        ]
+        if memory_budget is None:
+            return df.sort(partition_col, order_col, maintain_order=True).with_columns(*windows)
+
+        from .out_of_core import OutOfCoreExecutor
+        with OutOfCoreExecutor(memory_budget, spill_dir) as executor:
+            return executor.sort(
+                df, [partition_col, order_col], transform=lambda part: part.with_columns(*windows)
+            ).collect()
+
+    @accounted
+    def top_k(self, data: Union[pl.DataFrame, pl.LazyFrame], k: int,
+              by: Union[str, List[str]], descending: bool = True,
+              engine: Optional[str] = None) -> pl.DataFrame:
+        """
+        Retorna as `k` maiores (ou menores, com `descending=False`) linhas segundo `by`.
+        Usa selecao parcial (`top_k`/`bottom_k`) em vez de ordenar o DataFrame inteiro;
+        apenas as `k` linhas selecionadas sao ordenadas no final.
+        Sem `engine`, um LazyFrame e coletado com o motor de streaming.
+        """
+        lf = data.lazy()
+        selected = lf.top_k(k, by=by) if descending else lf.bottom_k(k, by=by)
+        selected = selected.sort(by, descending=descending)
+        return selected.collect(engine=engine or _default_engine(data))
+
+    @accounted
+    def top_k_per_group(self, data: Union[pl.DataFrame, pl.LazyFrame], partition_col: str,
+                        order_col: str, k: int, descending: bool = True,
+                        engine: Optional[str] = None) -> pl.DataFrame:
+        """
+        Retorna as `k` primeiras linhas de cada particao segundo `order_col`.
+        Alternativa a `apply_window_function` quando so o top N interessa: usa
+        `top_k_by` por grupo em vez de calcular `rank()` sobre a particao inteira.
+        """
+        lf = data.lazy()
+        others = pl.all().exclude(partition_col)
+        selected = (
+            lf.group_by(partition_col)
+            .agg(others.top_k_by(order_col, k=k, reverse=not descending))
+            .explode(others)
+            .select(lf.collect_schema().names())
+            .sort(partition_col, order_col, descending=[False, descending])
         )
+        return selected.collect(engine=engine or _default_engine(data))
 
+    def top_k_from_file(self, file_path: str, k: int, by: Union[str, List[str]],
+                        descending: bool = True, **kwargs) -> pl.DataFrame:
+        """
+        Calcula o top-k diretamente sobre um arquivo escaneado (CSV/Parquet/IPC),
+        em streaming, sem materializar o arquivo em memoria.
+        """
+        return self.top_k(self.scan_file(file_path, **kwargs), k, by, descending=descending)
+
+    @accounted
+    def resample_time_series(self, df: pl.DataFrame, time_col: str, every: str, aggs: List[pl.Expr],
+                             by: Optional[Union[str, List[str]]] = None, fill: str = "null",
+                             period: Optional[str] = None) -> pl.DataFrame:
+        """
+        Reamostra uma serie temporal em janelas de `every` ("1h", "1d", "1w", "1mo"...)
+        com `group_by_dynamic`, criando as janelas vazias e preenchendo-as segundo
+        `fill` ("null", "zero", "forward" ou "interpolate"). Dados ja ordenados
+        por tempo nao sao reordenados.
+        """
+        from . import time_series
+        return time_series.resample(df, time_col, every, aggs, by=by, fill=fill, period=period)
+
+    @accounted
+    def asof_join(self, left: pl.DataFrame, right: pl.DataFrame, on: str,
+                  by: Optional[Union[str, List[str]]] = None,
+                  tolerance: Optional[Union[str, int, float]] = None,
+                  strategy: str = "backward") -> pl.DataFrame:
+        """
+        Alinha `left` a `right` pelo valor de tempo mais proximo (`join_asof`),
+        com tolerancia e chaves de grupo opcionais, sem reordenar dados ja ordenados.
+        """
+        from . import time_series
+        return time_series.asof_align(left, right, on, by=by, tolerance=tolerance, strategy=strategy)
+
+    @accounted
     def handle_missing_data(self, df: pl.DataFrame, strategy: str = "mean", column: Optional[str] = None) -> pl.DataFrame:
         """
         Lida com dados ausentes na coluna especificada usando diferentes estrategias.
@@ -114,20 +382,60 @@ class PolarsDataProcessor:
         else:
             return df
 
-    def perform_join(self, df1: pl.DataFrame, df2: pl.DataFrame, on_col: str, how: str = "inner") -> pl.DataFrame:
+    @accounted
+    def perform_join(self, df1: pl.DataFrame, df2: pl.DataFrame, on_col: str, how: str = "inner",
+                     memory_budget: Optional[int] = None, spill_dir: Optional[str] = None,
+                     engine: str = "auto") -> pl.DataFrame:
         """
         Realiza um join entre dois DataFrames.
+        As linhas seguem a ordem de `df1` (de `df2` em joins "right").
+        Com `memory_budget` (bytes), usa um grace hash join que despeja particoes
+        em `spill_dir` como Arrow IPC, com o mesmo resultado do join em memoria;
+        sem ele, o join em memoria e coletado com `engine`.
+        """
+        if memory_budget is None:
+            return df1.lazy().join(
+                df2.lazy(), on=on_col, how=how,
+                maintain_order="right_left" if how == "right" else "left_right",
+            ).collect(engine=engine)
+
+        from .out_of_core import OutOfCoreExecutor
+        with OutOfCoreExecutor(memory_budget, spill_dir) as executor:
+            return executor.join(df1, df2, on_col, how=how).collect()
+
+    @accounted
+    def diff_snapshots(self, old: Union[pl.DataFrame, pl.LazyFrame], new: Union[pl.DataFrame, pl.LazyFrame],
+                       key: Union[str, List[str]], columns: Optional[List[str]] = None) -> SnapshotDiff:
+        """
+        Compara duas versoes de um dataset pela chave `key` e retorna as linhas
+        inseridas, removidas e atualizadas (com mascaras `changed_<coluna>`),
+        usando hash por linha e um unico join.
+        """
+        from .snapshot_diff import diff_snapshots
+        return diff_snapshots(old, new, key, columns)
+
+    @accounted
+    def deduplicate(self, df: Union[pl.DataFrame, pl.LazyFrame], subset: Optional[List[str]] = None,
+                    keep: str = "first", memory_budget: Optional[int] = None,
+                    spill_dir: Optional[str] = None) -> pl.DataFrame:
+        """
+        Remove duplicatas exatas (sem `subset`) ou por chave, mantendo a primeira
+        ou a ultima ocorrencia. Com `memory_budget`, roda fora da memoria.
         """
-        return df1.join(df2, on=on_col, how=how)
+        from .snapshot_diff import deduplicate
+        return deduplicate(df, subset, keep, memory_budget, spill_dir)
 
-    def execute_sql_query(self, df_map: Dict[str, pl.DataFrame], query: str) -> pl.DataFrame:
+    @accounted
+    def execute_sql_query(self, df_map: Dict[str, pl.DataFrame], query: str,
+                          engine: str = "auto") -> pl.DataFrame:
         """
         Executa uma query SQL diretamente em DataFrames Polars usando o contexto SQL.
         `df_map` é um dicionário onde as chaves são os nomes das tabelas na query SQL
-        e os valores são os DataFrames Polars correspondentes.
+        e os valores são os DataFrames Polars correspondentes. O plano resultante
+        e coletado com `engine`.
         """
         sql_context = pl.SQLContext()
         for table_name, df in df_map.items():
             sql_context.register(table_name, df)
-        return sql_context.execute(query).collect()
+        return sql_context.execute(query).collect(engine=engine)
 
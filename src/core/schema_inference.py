@@ -0,0 +1,167 @@
+"""
+Polars High-Speed DataFrames
+Author: Gabriel Demetrios Lafis
+Year: 2025
+
+Inferencia de schema de CSV por amostragem e cache de schemas por arquivo.
+A amostra combina linhas do inicio, do meio e do fim do arquivo, de modo que
+tipos que so aparecem tarde no arquivo sejam detectados sem uma passada completa
+(`infer_schema_length=None`). O schema inferido e persistido num arquivo lateral
+(`<arquivo>.schema.json`) e reutilizado enquanto o arquivo nao mudar, permitindo
+leituras posteriores com schema explicito e custo de inferencia zero.
+"""
+
+import io
+import json
+import os
+import polars as pl
+from typing import Any, Dict, List, Optional
+
+SIDECAR_SUFFIX = ".schema.json"
+
+
+def _dtype_to_json(dtype: pl.DataType) -> Dict[str, Any]:
+    if isinstance(dtype, pl.Datetime):
+        return {"type": "Datetime", "time_unit": dtype.time_unit, "time_zone": dtype.time_zone}
+    if isinstance(dtype, pl.Duration):
+        return {"type": "Duration", "time_unit": dtype.time_unit}
+    name = str(dtype)
+    if not isinstance(getattr(pl, name, None), type):
+        raise ValueError(f"Tipo nao suportado no cache de schema: {dtype}")
+    return {"type": name}
+
+
+def _dtype_from_json(spec: Dict[str, Any]) -> pl.DataType:
+    if spec["type"] == "Datetime":
+        return pl.Datetime(spec["time_unit"], spec["time_zone"])
+    if spec["type"] == "Duration":
+        return pl.Duration(spec["time_unit"])
+    return getattr(pl, spec["type"])()
+
+
+def _read_lines(handle, count: int) -> List[bytes]:
+    lines = []
+    for _ in range(count):
+        line = handle.readline()
+        if not line:
+            break
+        lines.append(line if line.endswith(b"\n") else line + b"\n")
+    return lines
+
+
+def sample_csv_bytes(file_path: str, sample_rows: int = 1_000, segments: int = 3) -> bytes:
+    """
+    Retorna o cabecalho seguido de ate `sample_rows` linhas retiradas de `segments`
+    posicoes igualmente espacadas entre o inicio e o fim do arquivo.
+    """
+    size = os.path.getsize(file_path)
+    per_segment = max(sample_rows // max(segments, 1), 1)
+    with open(file_path, "rb") as handle:
+        header = handle.readline()
+        body_start = handle.tell()
+        head = _read_lines(handle, per_segment)
+        if segments <= 1 or handle.tell() >= size:
+            return header + b"".join(head)
+
+        # O ultimo segmento comeca um pouco antes do necessario e mantem so
+        # as ultimas linhas, garantindo que o fim do arquivo seja amostrado
+        line_bytes = max((handle.tell() - body_start) / max(len(head), 1), 1.0)
+        tail_start = max(handle.tell(), int(size - line_bytes * per_segment * 2))
+        lines = head
+        for i in range(1, segments):
+            offset = body_start + (tail_start - body_start) * i // (segments - 1)
+            handle.seek(offset)
+            handle.readline()  # descarta a linha parcial
+            if i < segments - 1:
+                lines.extend(_read_lines(handle, per_segment))
+            else:
+                tail = handle.read().splitlines(keepends=True)[-per_segment:]
+                lines.extend(line if line.endswith(b"\n") else line + b"\n" for line in tail)
+    return header + b"".join(lines)
+
+
+class SchemaInferenceService:
+    """
+    Infere schemas de CSV por amostragem e os mantem num cache lateral.
+
+    O cache e invalidado quando o tamanho ou o mtime do arquivo mudam, ou quando
+    as opcoes de leitura usadas na inferencia sao diferentes. Com `cache_dir`, os
+    arquivos laterais sao gravados nesse diretorio em vez de ao lado do CSV.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, sample_rows: int = 1_000, segments: int = 3):
+        self.cache_dir = cache_dir
+        self.sample_rows = sample_rows
+        self.segments = segments
+
+    def sidecar_path(self, file_path: str) -> str:
+        """Caminho do arquivo lateral que guarda o schema de `file_path`."""
+        if self.cache_dir is None:
+            return file_path + SIDECAR_SUFFIX
+        name = os.path.abspath(file_path).strip(os.sep).replace(os.sep, "__")
+        return os.path.join(self.cache_dir, name + SIDECAR_SUFFIX)
+
+    @staticmethod
+    def _fingerprint(file_path: str, read_options: Dict[str, Any]) -> Dict[str, Any]:
+        stat = os.stat(file_path)
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "options": repr(sorted(read_options.items())),
+        }
+
+    def infer(self, file_path: str, **kwargs) -> Dict[str, pl.DataType]:
+        """Infere o schema a partir de uma amostra do inicio, meio e fim do arquivo."""
+        try:
+            sample = sample_csv_bytes(file_path, self.sample_rows, self.segments)
+            df = pl.read_csv(io.BytesIO(sample), infer_schema_length=None, **kwargs)
+        except pl.exceptions.PolarsError:
+            # Ex.: campos entre aspas com quebras de linha cortados pela amostragem
+            df = pl.read_csv(file_path, n_rows=self.sample_rows, infer_schema_length=None, **kwargs)
+        return dict(df.schema)
+
+    def load_cached(self, file_path: str, **kwargs) -> Optional[Dict[str, pl.DataType]]:
+        """Retorna o schema em cache se ainda for valido para o arquivo, senao `None`."""
+        try:
+            with open(self.sidecar_path(file_path)) as sidecar:
+                cached = json.load(sidecar)
+        except (OSError, ValueError):
+            return None
+        if cached.get("fingerprint") != self._fingerprint(file_path, kwargs):
+            return None
+        return {name: _dtype_from_json(spec) for name, spec in cached["schema"]}
+
+    def get_schema(self, file_path: str, refresh: bool = False, **kwargs) -> Dict[str, pl.DataType]:
+        """Retorna o schema do cache ou, se ausente/obsoleto, infere e persiste um novo."""
+        if not refresh:
+            cached = self.load_cached(file_path, **kwargs)
+            if cached is not None:
+                return cached
+
+        schema = self.infer(file_path, **kwargs)
+        self.store(file_path, schema, **kwargs)
+        return schema
+
+    def store(self, file_path: str, schema: Dict[str, pl.DataType], **kwargs):
+        """Persiste `schema` como schema conhecido de `file_path` (tipos nao serializaveis sao ignorados)."""
+        try:
+            payload = {
+                "fingerprint": self._fingerprint(file_path, kwargs),
+                "schema": [[name, _dtype_to_json(dtype)] for name, dtype in schema.items()],
+            }
+        except ValueError:
+            return
+        path = self.sidecar_path(file_path)
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as sidecar:
+            json.dump(payload, sidecar)
+        os.replace(tmp_path, path)
+
+    def invalidate(self, file_path: str):
+        """Remove o schema em cache de `file_path`."""
+        try:
+            os.remove(self.sidecar_path(file_path))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,266 @@
+"""
+Polars High-Speed DataFrames
+Author: Gabriel Demetrios Lafis
+Year: 2025
+
+Servidor local de consultas com tabelas residentes em memoria. As tabelas sao
+carregadas uma unica vez (ou mapeadas em memoria, no caso de arquivos IPC) e
+atendem a muitas requisicoes pequenas de SQL ou de pipelines do processador,
+sem o custo de recarregar os dados a cada execucao. Os resultados sao devolvidos
+como streams Arrow IPC.
+
+Protocolo (HTTP em localhost ou num socket Unix):
+- GET  /tables                       -> {"tabela": {"rows": n, "columns": [...]}}
+- POST /tables   {"name", "path", "mmap"}  registra (ou recarrega) uma tabela
+- POST /sql      {"query"}           -> Arrow IPC stream
+- POST /pipeline {"table", "steps"}  -> Arrow IPC stream
+
+Cada passo de pipeline e um objeto {"op": ..., ...}; ver `PIPELINE_OPS`.
+"""
+
+import http.client
+import io
+import json
+import os
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Union
+
+import polars as pl
+
+from .polars_demo import PolarsDataProcessor
+
+ARROW_STREAM_TYPE = "application/vnd.apache.arrow.stream"
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_QUEUE_TIMEOUT = 5.0
+
+
+class AdmissionError(RuntimeError):
+    """Requisicao recusada porque o servidor atingiu o limite de concorrencia."""
+
+
+class QueryService:
+    """
+    Registro de tabelas residentes e execucao de consultas com controle de admissao:
+    no maximo `max_concurrent` consultas rodam ao mesmo tempo e as demais esperam
+    ate `queue_timeout` segundos antes de serem recusadas.
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 queue_timeout: float = DEFAULT_QUEUE_TIMEOUT):
+        self.processor = PolarsDataProcessor()
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._tables: Dict[str, Union[pl.DataFrame, pl.LazyFrame]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, source: Union[str, pl.DataFrame, pl.LazyFrame], mmap: bool = False):
+        """
+        Registra `source` (DataFrame, LazyFrame ou caminho de arquivo) como `name`.
+        Arquivos sao lidos para a memoria; com `mmap=True`, arquivos IPC ficam
+        mapeados em memoria (`scan_ipc`) em vez de copiados.
+        """
+        if isinstance(source, str):
+            if mmap:
+                if not source.lower().endswith((".ipc", ".arrow", ".feather")):
+                    raise ValueError("mmap so e suportado para arquivos IPC")
+                table = pl.scan_ipc(source)
+            else:
+                table = self.processor.scan_file(source).collect()
+        else:
+            table = source
+        with self._lock:
+            self._tables[name] = table
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._tables.pop(name, None)
+
+    def describe(self) -> Dict[str, Any]:
+        with self._lock:
+            tables = dict(self._tables)
+        description = {}
+        for name, table in tables.items():
+            description[name] = {
+                "columns": table.collect_schema().names(),
+                "rows": table.height if isinstance(table, pl.DataFrame) else None,
+                "mmap": isinstance(table, pl.LazyFrame),
+            }
+        return description
+
+    def resident(self, name: str) -> pl.DataFrame:
+        """Tabela registrada como `name`, materializada se estiver mapeada em memoria."""
+        with self._lock:
+            if name not in self._tables:
+                raise KeyError(f"Tabela desconhecida: {name}")
+            table = self._tables[name]
+        return table.collect() if isinstance(table, pl.LazyFrame) else table
+
+    def _admit(self):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise AdmissionError("Servidor ocupado; tente novamente")
+
+    def sql(self, query: str) -> pl.DataFrame:
+        """Executa `query` sobre as tabelas registradas."""
+        self._admit()
+        try:
+            with self._lock:
+                frames = dict(self._tables)
+            return pl.SQLContext(frames=frames).execute(query).collect()
+        finally:
+            self._slots.release()
+
+    def pipeline(self, table: str, steps: List[Dict[str, Any]]) -> pl.DataFrame:
+        """Aplica os passos de `steps` (ver `PIPELINE_OPS`) a uma tabela registrada."""
+        self._admit()
+        try:
+            df = self.resident(table)
+            for step in steps:
+                step = dict(step)
+                op = step.pop("op")
+                if op not in PIPELINE_OPS:
+                    raise ValueError(f"Operacao de pipeline desconhecida: {op}")
+                df = PIPELINE_OPS[op](self, df, **step)
+            return df
+        finally:
+            self._slots.release()
+
+
+PIPELINE_OPS = {
+    "filter": lambda s, df, where: s.processor.filter_by_condition(df, pl.sql_expr(where)),
+    "select": lambda s, df, columns: df.select(columns),
+    "with_columns": lambda s, df, exprs: df.with_columns(pl.sql_expr(exprs)),
+    "summary": lambda s, df, group_col, agg_col: s.processor.calculate_summary_statistics(df, group_col, agg_col),
+    "top_k": lambda s, df, k, by, descending=True: s.processor.top_k(df, k, by, descending=descending),
+    "top_k_per_group": lambda s, df, partition_col, order_col, k, descending=True:
+        s.processor.top_k_per_group(df, partition_col, order_col, k, descending=descending),
+    "join": lambda s, df, table, on, how="inner": s.processor.perform_join(df, s.resident(table), on, how=how),
+    "sort": lambda s, df, by, descending=False: df.sort(by, descending=descending),
+    "head": lambda s, df, n: df.head(n),
+}
+
+
+def to_ipc_stream(df: pl.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    df.write_ipc_stream(buffer)
+    return buffer.getvalue()
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    service: QueryService = None  # definido por make_server
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any):
+        self._send(status, json.dumps(payload).encode(), "application/json")
+
+    def do_GET(self):
+        if self.path == "/tables":
+            self._send_json(200, self.service.describe())
+        else:
+            self._send_json(404, {"error": f"Rota desconhecida: {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == "/sql":
+                result = self.service.sql(request["query"])
+            elif self.path == "/pipeline":
+                result = self.service.pipeline(request["table"], request.get("steps", []))
+            elif self.path == "/tables":
+                self.service.register(request["name"], request["path"], mmap=request.get("mmap", False))
+                self._send_json(200, self.service.describe())
+                return
+            else:
+                self._send_json(404, {"error": f"Rota desconhecida: {self.path}"})
+                return
+        except AdmissionError as exc:
+            self._send_json(503, {"error": str(exc)})
+            return
+        except (KeyError, ValueError, TypeError, pl.exceptions.PolarsError) as exc:
+            self._send_json(400, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        self._send(200, to_ipc_stream(result), ARROW_STREAM_TYPE)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler espera um endereco (host, porta)
+        return request, ("local", 0)
+
+
+def make_server(service: QueryService, host: str = "127.0.0.1", port: int = 8765,
+                unix_socket: Optional[str] = None):
+    """Cria o servidor HTTP (TCP em localhost ou socket Unix) para `service`."""
+    handler = type("QueryHandler", (_QueryHandler,), {"service": service})
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        return _UnixHTTPServer(unix_socket, handler)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+class QueryClient:
+    """Cliente do servidor local; resultados voltam como DataFrames."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765,
+                 unix_socket: Optional[str] = None, timeout: Optional[float] = 60.0):
+        self.host, self.port, self.unix_socket, self.timeout = host, port, unix_socket, timeout
+
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None):
+        if self.unix_socket is not None:
+            connection = _UnixHTTPConnection(self.unix_socket, self.timeout)
+        else:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            body = json.dumps(payload).encode() if payload is not None else None
+            connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            data = response.read()
+        finally:
+            connection.close()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}: {json.loads(data).get('error')}")
+        if response.getheader("Content-Type") == ARROW_STREAM_TYPE:
+            return pl.read_ipc_stream(io.BytesIO(data))
+        return json.loads(data)
+
+    def tables(self) -> Dict[str, Any]:
+        return self._request("GET", "/tables")
+
+    def register(self, name: str, path: str, mmap: bool = False) -> Dict[str, Any]:
+        return self._request("POST", "/tables", {"name": name, "path": path, "mmap": mmap})
+
+    def sql(self, query: str) -> pl.DataFrame:
+        return self._request("POST", "/sql", {"query": query})
+
+    def pipeline(self, table: str, steps: List[Dict[str, Any]]) -> pl.DataFrame:
+        return self._request("POST", "/pipeline", {"table": table, "steps": steps})
@@ -0,0 +1,246 @@
+"""
+Polars High-Speed DataFrames
+Author: Gabriel Demetrios Lafis
+Year: 2025
+
+Cache de materializacao de etapas de pipeline. O resultado de cada etapa nomeada
+e gravado em disco (IPC ou Parquet) sob uma chave derivada das impressoes digitais
+dos arquivos de entrada (caminho, tamanho, mtime e hash do conteudo), das chaves
+das etapas anteriores, dos parametros da etapa e do codigo da funcao da etapa
+(bytecode, constantes e nomes referenciados). Como a chave de uma etapa nao
+depende de executar as anteriores, alterar apenas a ultima etapa reaproveita todo
+o trabalho anterior.
+
+O disco e limitado por tamanho com despejo LRU (recencia pelo mtime dos arquivos)
+e um nivel em memoria guarda as entradas mais usadas.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import types
+from collections import OrderedDict
+import polars as pl
+from typing import Any, Callable, Dict, Optional, Sequence, Union
+
+HASH_CHUNK_BYTES = 1 << 20
+FINGERPRINTS_FILE = "fingerprints.json"
+
+
+def _code_digest(code: types.CodeType, digest) -> None:
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            # Funcoes aninhadas (lambdas, closures): o repr do objeto traz o endereco
+            _code_digest(const, digest)
+        else:
+            digest.update(repr(const).encode())
+
+
+def code_fingerprint(function: Callable) -> str:
+    """
+    Impressao digital do codigo de `function`: nome qualificado, bytecode,
+    constantes e nomes referenciados (sem numeros de linha, entao mover a funcao
+    no arquivo nao a altera). Parciais incluem os argumentos fixados; funcoes sem
+    bytecode (ex.: implementadas em C) usam so o modulo e o nome.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    while isinstance(function, functools.partial):
+        digest.update(repr((function.args, sorted(function.keywords.items()))).encode())
+        function = function.func
+    function = getattr(function, "__func__", function)
+    name = f"{getattr(function, '__module__', None)}.{getattr(function, '__qualname__', repr(type(function)))}"
+    digest.update(name.encode())
+    code = getattr(function, "__code__", None)
+    if code is not None:
+        _code_digest(code, digest)
+    return digest.hexdigest()
+
+
+class Stage:
+    """
+    Referencia preguicosa ao resultado de uma etapa. A chave e conhecida na
+    criacao; o DataFrame so e lido do cache ou calculado em `result()`.
+    """
+
+    def __init__(self, cache: "StageCache", name: str, key: str,
+                 compute: Callable[..., pl.DataFrame], inputs: Sequence[Union[str, "Stage"]]):
+        self.cache = cache
+        self.name = name
+        self.key = key
+        self._compute = compute
+        self._inputs = list(inputs)
+
+    def result(self) -> pl.DataFrame:
+        """Retorna o resultado da etapa, calculando-o (e as dependencias) so se necessario."""
+        cached = self.cache.get(self.key)
+        if cached is not None:
+            return cached
+        resolved = [item.result() if isinstance(item, Stage) else item for item in self._inputs]
+        df = self._compute(*resolved)
+        self.cache.put(self.key, df)
+        return df
+
+
+class StageCache:
+    """
+    Cache de resultados de etapas em `cache_dir`, com no maximo `max_bytes` em
+    disco e `memory_max_bytes` (tamanho estimado) no nivel em memoria.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1 << 30,
+                 memory_max_bytes: int = 256 << 20, file_format: str = "ipc"):
+        if file_format not in ("ipc", "parquet"):
+            raise ValueError(f"Formato de cache nao suportado: {file_format}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.memory_max_bytes = memory_max_bytes
+        self.file_format = file_format
+        self._memory: "OrderedDict[str, pl.DataFrame]" = OrderedDict()
+        self._memory_bytes = 0
+        self._fingerprints: Optional[Dict[str, Any]] = None
+        self.hits = 0
+        self.misses = 0
+
+    # Impressoes digitais -------------------------------------------------
+
+    def _load_fingerprints(self) -> Dict[str, Any]:
+        if self._fingerprints is None:
+            try:
+                with open(os.path.join(self.cache_dir, FINGERPRINTS_FILE)) as handle:
+                    self._fingerprints = json.load(handle)
+            except (OSError, ValueError):
+                self._fingerprints = {}
+        return self._fingerprints
+
+    def fingerprint_file(self, file_path: str) -> Dict[str, Any]:
+        """
+        Impressao digital de um arquivo: caminho absoluto, tamanho, mtime e hash
+        BLAKE2 do conteudo. O hash e memorizado enquanto tamanho e mtime nao mudam.
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        fingerprint = {"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        known = self._load_fingerprints().get(path)
+        if known is not None and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            fingerprint["content_hash"] = known["content_hash"]
+            return fingerprint
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(HASH_CHUNK_BYTES), b""):
+                digest.update(chunk)
+        fingerprint["content_hash"] = digest.hexdigest()
+        self._fingerprints[path] = fingerprint
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = os.path.join(self.cache_dir, FINGERPRINTS_FILE + ".tmp")
+        with open(tmp_path, "w") as handle:
+            json.dump(self._fingerprints, handle)
+        os.replace(tmp_path, os.path.join(self.cache_dir, FINGERPRINTS_FILE))
+        return fingerprint
+
+    def stage(self, name: str, compute: Callable[..., pl.DataFrame],
+              inputs: Sequence[Union[str, Stage]] = (), params: Optional[Dict[str, Any]] = None,
+              version: Optional[str] = None) -> Stage:
+        """
+        Declara uma etapa. `inputs` contem caminhos de arquivo ou etapas anteriores;
+        `compute` recebe os caminhos e os DataFrames das etapas, na mesma ordem.
+
+        Editar o corpo de `compute` muda a chave (ver `code_fingerprint`); mudancas
+        em funcoes chamadas por ela nao sao detectadas, e para elas basta trocar
+        `version`.
+        """
+        parts = []
+        for item in inputs:
+            if isinstance(item, Stage):
+                parts.append({"stage": item.key})
+            else:
+                fingerprint = self.fingerprint_file(item)
+                parts.append({key: fingerprint[key] for key in ("path", "content_hash")})
+        payload = json.dumps(
+            {"name": name, "inputs": parts, "params": params or {},
+             "code": code_fingerprint(compute), "version": version},
+            sort_keys=True, default=str,
+        )
+        key = f"{name}-{hashlib.sha256(payload.encode()).hexdigest()[:32]}"
+        return Stage(self, name, key, compute, inputs)
+
+    # Armazenamento -----------------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{self.file_format}")
+
+    def _remember(self, key: str, df: pl.DataFrame):
+        size = df.estimated_size()
+        if size > self.memory_max_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key).estimated_size()
+        self._memory[key] = df
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.estimated_size()
+
+    def get(self, key: str) -> Optional[pl.DataFrame]:
+        """Retorna a entrada `key` (memoria primeiro, depois disco) ou `None`."""
+        path = self._path(key)
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            try:
+                # O LRU do disco tambem deve ver os acessos servidos pela memoria
+                os.utime(path)
+            except OSError:
+                pass
+            self.hits += 1
+            return self._memory[key]
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        df = pl.read_ipc(path) if self.file_format == "ipc" else pl.read_parquet(path)
+        os.utime(path)  # marca como usado recentemente para o LRU
+        self._remember(key, df)
+        self.hits += 1
+        return df
+
+    def put(self, key: str, df: pl.DataFrame):
+        """Grava `df` sob `key` e despeja entradas antigas se o limite for excedido."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        if self.file_format == "ipc":
+            df.write_ipc(tmp_path)
+        else:
+            df.write_parquet(tmp_path)
+        os.replace(tmp_path, path)
+        self._remember(key, df)
+        self.evict()
+
+    def evict(self):
+        """Remove as entradas em disco usadas ha mais tempo ate caber em `max_bytes`."""
+        suffix = f".{self.file_format}"
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(suffix):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            key = name[:-len(suffix)]
+            if key in self._memory:
+                self._memory_bytes -= self._memory.pop(key).estimated_size()
+            total -= size
+
+    def clear(self):
+        """Remove todas as entradas (memoria e disco)."""
+        self._memory.clear()
+        self._memory_bytes = 0
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(f".{self.file_format}"):
+                    os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,91 @@
+"""
+Polars High-Speed DataFrames
+Author: Gabriel Demetrios Lafis
+Year: 2025
+
+Operacoes de series temporais: reamostragem em intervalos arbitrarios com
+`group_by_dynamic` e preenchimento de lacunas (`upsample`), e alinhamento por
+tempo com `join_asof`. Ambas exigem dados ordenados por tempo (dentro de cada
+grupo); a ordenacao so e feita quando a verificacao linear indica que e preciso,
+de modo que dados ja ordenados sao processados em tempo linear.
+"""
+
+import polars as pl
+from typing import List, Optional, Sequence, Union
+
+FILL_STRATEGIES = ("null", "zero", "forward", "interpolate")
+
+
+def _as_list(columns: Union[str, Sequence[str], None]) -> List[str]:
+    if columns is None:
+        return []
+    return [columns] if isinstance(columns, str) else list(columns)
+
+
+def is_time_sorted(df: pl.DataFrame, time_col: str, by: Union[str, Sequence[str], None] = None) -> bool:
+    """Verifica em O(n) se `time_col` e crescente (dentro de cada grupo de `by`)."""
+    by = _as_list(by)
+    if not by:
+        return df.get_column(time_col).is_sorted()
+    decreasing = (pl.col(time_col).to_physical().diff() < 0).over(by).any()
+    return not df.select(decreasing).item()
+
+
+def ensure_time_sorted(df: pl.DataFrame, time_col: str,
+                       by: Union[str, Sequence[str], None] = None) -> pl.DataFrame:
+    """Retorna `df` intacto se ja estiver ordenado por tempo; senao, ordena."""
+    by = _as_list(by)
+    if is_time_sorted(df, time_col, by):
+        if not by:
+            return df.with_columns(pl.col(time_col).set_sorted())
+        return df
+    df = df.sort(*by, time_col)
+    return df if by else df.with_columns(pl.col(time_col).set_sorted())
+
+
+def resample(df: pl.DataFrame, time_col: str, every: str, aggs: Sequence[pl.Expr],
+             by: Union[str, Sequence[str], None] = None, fill: str = "null",
+             period: Optional[str] = None, closed: str = "left") -> pl.DataFrame:
+    """
+    Agrega `df` em janelas de `every` (ex.: "15m", "1d", "1w", "1mo") por `time_col`,
+    opcionalmente por grupo `by`. Janelas sem dados dentro do intervalo de cada
+    grupo sao criadas e preenchidas conforme `fill`: "null" (mantem nulos),
+    "zero", "forward" (ultimo valor) ou "interpolate".
+    """
+    if fill not in FILL_STRATEGIES:
+        raise ValueError(f"Estrategia de preenchimento desconhecida: {fill} (use uma de {FILL_STRATEGIES})")
+    by = _as_list(by)
+    df = ensure_time_sorted(df, time_col, by)
+    resampled = df.group_by_dynamic(
+        time_col, every=every, period=period, closed=closed, group_by=by or None
+    ).agg(*aggs)
+    resampled = resampled.upsample(time_col, every=every, group_by=by or None, maintain_order=True)
+
+    values = [name for name in resampled.columns if name != time_col and name not in by]
+    if fill == "zero":
+        resampled = resampled.with_columns(pl.col(values).fill_null(0))
+    elif fill == "forward":
+        fill_expr = pl.col(values).forward_fill()
+        resampled = resampled.with_columns(fill_expr.over(by) if by else fill_expr)
+    elif fill == "interpolate":
+        fill_expr = pl.col(values).interpolate()
+        resampled = resampled.with_columns(fill_expr.over(by) if by else fill_expr)
+    return resampled
+
+
+def asof_align(left: pl.DataFrame, right: pl.DataFrame, on: str,
+               by: Union[str, Sequence[str], None] = None,
+               tolerance: Union[str, int, float, None] = None,
+               strategy: str = "backward") -> pl.DataFrame:
+    """
+    Associa a cada linha de `left` a linha de `right` mais proxima no tempo
+    (`strategy`: "backward", "forward" ou "nearest"), dentro de `tolerance`
+    (ex.: "1h", "2d") e, com `by`, apenas entre linhas do mesmo grupo. Com `by`,
+    basta que os dados estejam ordenados por tempo dentro de cada grupo.
+    """
+    by = _as_list(by)
+    left = ensure_time_sorted(left, on, by)
+    right = ensure_time_sorted(right, on, by)
+    return left.join_asof(
+        right, on=on, by=by or None, tolerance=tolerance, strategy=strategy, check_sortedness=False
+    )
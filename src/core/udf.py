@@ -0,0 +1,148 @@
+"""
+Polars High-Speed DataFrames
+Author: Gabriel Demetrios Lafis
+Year: 2025
+
+Registro de funcoes definidas pelo usuario (UDFs) executadas em lote. Em vez de
+`map_elements`, que chama Python linha a linha sob o GIL, as UDFs recebem
+Series inteiras ("series") ou arrays NumPy ("numpy", opcionalmente compiladas
+com Numba) e entram no plano via `map_batches` com tipo de saida declarado.
+UDFs registradas com `elementwise=True` (cada valor de saida depende apenas da
+linha correspondente) podem rodar por chunk; as demais recebem a coluna inteira.
+
+UDFs linha a linha ("row") continuam aceitas, mas passam por um lint no
+registro: a funcao e chamada com `pl.col(...)` e, se devolver uma expressao, ela
+podia ser escrita com expressoes nativas e um `UDFLintWarning` sugere a troca.
+"""
+
+import warnings
+from typing import Callable, Dict, NamedTuple, Optional, Sequence
+
+import polars as pl
+
+KINDS = ("series", "numpy", "row")
+
+
+class UDFLintWarning(UserWarning):
+    """UDF linha a linha que poderia ser substituida por uma expressao nativa."""
+
+
+class UDF(NamedTuple):
+    """UDF registrada: funcao executavel, tipo de saida e modo de chamada."""
+    name: str
+    function: Callable
+    return_dtype: pl.DataType
+    kind: str
+    jit: bool
+    elementwise: bool = False
+
+
+def _numba_njit() -> Optional[Callable]:
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit
+
+
+def lint_row_udf(function: Callable, column: str = "x") -> Optional[pl.Expr]:
+    """
+    Retorna a expressao nativa equivalente a `function` (UDF de um valor) quando
+    ela pode ser construida aplicando a funcao a `pl.col(column)`; senao, None.
+    A funcao e de fato chamada, entao deve ser livre de efeitos colaterais.
+    """
+    try:
+        result = function(pl.col(column))
+    except Exception:
+        return None
+    return result if isinstance(result, pl.Expr) else None
+
+
+class UDFRegistry:
+    """UDFs nomeadas, convertidas em expressoes Polars com `expr`."""
+
+    def __init__(self):
+        self._udfs: Dict[str, UDF] = {}
+
+    def register(self, name: str, function: Callable, return_dtype: pl.DataType,
+                 kind: str = "series", jit: bool = False, elementwise: bool = False) -> UDF:
+        """
+        Registra `function` como `name`.
+
+        - "series": `function(*series) -> Series`;
+        - "numpy": `function(*arrays) -> array`; com `jit=True` e o Numba
+          instalado, a funcao e compilada com `numba.njit`;
+        - "row": `function(valor) -> valor` via `map_elements` (lento; gera
+          `UDFLintWarning` quando uma expressao nativa bastaria).
+
+        Declare `elementwise=True` apenas se a saida de cada linha depende so
+        daquela linha: o Polars pode entao dividir a entrada em chunks e empurrar
+        filtros para antes da UDF. Funcoes que olham a coluna inteira (medias,
+        ranks, deslocamentos) devem manter o padrao False.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Tipo de UDF desconhecido: {kind} (use um de {KINDS})")
+        compiled = False
+        if kind == "numpy":
+            try:
+                import numpy  # noqa: F401
+            except ImportError as exc:
+                raise ImportError("UDFs do tipo 'numpy' exigem o pacote numpy") from exc
+            njit = _numba_njit() if jit else None
+            if njit is not None:
+                function, compiled = njit(function), True
+        elif kind == "row":
+            native = lint_row_udf(function)
+            if native is not None:
+                warnings.warn(
+                    f"UDF '{name}' roda linha a linha mas equivale a expressao nativa {native}; "
+                    f"prefira a expressao (ex.: df.with_columns(...)) a map_elements",
+                    UDFLintWarning,
+                    stacklevel=3,
+                )
+        udf = UDF(name, function, return_dtype, kind, compiled, elementwise)
+        self._udfs[name] = udf
+        return udf
+
+    def get(self, name: str) -> UDF:
+        if name not in self._udfs:
+            raise KeyError(f"UDF nao registrada: {name}")
+        return self._udfs[name]
+
+    def names(self):
+        return list(self._udfs)
+
+    def expr(self, name: str, *columns: str, alias: Optional[str] = None) -> pl.Expr:
+        """Expressao que aplica a UDF `name` as colunas `columns` (nome de saida: `alias` ou `name`)."""
+        udf = self.get(name)
+        if not columns:
+            raise ValueError("Informe ao menos uma coluna de entrada")
+        if udf.kind == "row":
+            if len(columns) != 1:
+                raise ValueError("UDFs do tipo 'row' recebem uma unica coluna")
+            expr = pl.col(columns[0]).map_elements(udf.function, return_dtype=udf.return_dtype)
+            return expr.alias(alias or name)
+
+        def call(*series: pl.Series) -> pl.Series:
+            if udf.kind == "numpy":
+                result = udf.function(*[s.to_numpy() for s in series])
+            else:
+                result = udf.function(*series)
+            if not isinstance(result, pl.Series):
+                result = pl.Series(series[0].name, result)
+            return result.cast(udf.return_dtype)
+
+        options = {"is_elementwise": True} if udf.elementwise else {}
+        if len(columns) == 1:
+            expr = pl.col(columns[0]).map_batches(call, return_dtype=udf.return_dtype, **options)
+        else:
+            expr = pl.struct(columns).map_batches(
+                lambda s: call(*[s.struct.field(column) for column in columns]),
+                return_dtype=udf.return_dtype,
+                **options,
+            )
+        return expr.alias(alias or name)
+
+    def apply(self, df: pl.DataFrame, name: str, columns: Sequence[str],
+              alias: Optional[str] = None) -> pl.DataFrame:
+        return df.with_columns(self.expr(name, *columns, alias=alias))
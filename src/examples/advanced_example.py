@@ -2,11 +2,22 @@ import polars as pl
 import os
 
 class AdvancedPolarsProcessor:
-    def __init__(self):
-        self.data_dir = "data"
-        os.makedirs(self.data_dir, exist_ok=True)
+    def __init__(self, data_dir: str = "data", cache=None, memory=None):
+        # O diretorio so e criado quando dados sao gravados (create_sample_data)
+        self.data_dir = data_dir
+        # StageCache opcional (core.stage_cache) para materializar etapas entre execucoes
+        self.cache = cache
+        # MemoryGovernor opcional (core.memory) para medir e limitar a memoria de cada etapa
+        self.memory = memory
+
+    def _accounted(self, name: str, step):
+        if self.memory is None:
+            return step
+        return lambda *args: self.memory.run(name, step, *args)
 
     def create_sample_data(self):
+        os.makedirs(self.data_dir, exist_ok=True)
+
         # Criar dados de vendas simulados
         sales_data = {
             "order_id": range(1, 1001),
@@ -34,38 +45,70 @@ class AdvancedPolarsProcessor:
         return sales_df, customer_df
 
     def load_data(self):
-        sales_df = pl.read_csv(os.path.join(self.data_dir, "sales_data.csv"))
-        customer_df = pl.read_parquet(os.path.join(self.data_dir, "customer_data.parquet"))
+        sales_path = os.path.join(self.data_dir, "sales_data.csv")
+        customer_path = os.path.join(self.data_dir, "customer_data.parquet")
+        if self.cache is None:
+            return pl.read_csv(sales_path), pl.read_parquet(customer_path)
+
+        # Com cache, o CSV so e re-lido quando o arquivo muda
+        sales_df = self.cache.stage("load_sales", pl.read_csv, [sales_path]).result()
+        customer_df = self.cache.stage("load_customers", pl.read_parquet, [customer_path]).result()
         return sales_df, customer_df
 
-    def process_sales_data(self, sales_df: pl.DataFrame, customer_df: pl.DataFrame):
-        # 1. Calcular o valor total da venda
-        sales_df = sales_df.with_columns(
+    @staticmethod
+    def _read_sales(sales_path: str) -> pl.DataFrame:
+        return pl.read_csv(sales_path, try_parse_dates=True)
+
+    @staticmethod
+    def _add_total_sale_value(sales_df: pl.DataFrame) -> pl.DataFrame:
+        return sales_df.with_columns(
             (pl.col("price") * pl.col("quantity")).alias("total_sale_value")
         )
 
-        # 2. Juntar com dados de clientes
-        joined_df = sales_df.join(customer_df, on="customer_id", how="left")
+    @staticmethod
+    def _join_customers(sales_df: pl.DataFrame, customer_df: pl.DataFrame) -> pl.DataFrame:
+        return sales_df.join(customer_df, on="customer_id", how="left")
 
-        # 3. Análise de vendas por categoria e região
-        sales_summary = joined_df.group_by(["category", "region"]).agg(
+    @staticmethod
+    def _summarize_sales(joined_df: pl.DataFrame) -> pl.DataFrame:
+        return joined_df.group_by(["category", "region"]).agg(
             pl.sum("total_sale_value").alias("total_revenue"),
             pl.len().alias("number_of_orders"),
             pl.mean("quantity").alias("avg_quantity_per_order")
         ).sort(pl.col("total_revenue"), descending=True)
 
-        # 4. Clientes com maior gasto (Top 5)
-        top_customers = joined_df.group_by("customer_id").agg(
+    @staticmethod
+    def _top_customers(joined_df: pl.DataFrame, top_n: int = 5) -> pl.DataFrame:
+        return joined_df.group_by("customer_id").agg(
             pl.sum("total_sale_value").alias("total_spent")
-        ).sort(pl.col("total_spent"), descending=True).head(5)
+        ).top_k(top_n, by=["total_spent", "customer_id"], reverse=[False, True]).sort(
+            ["total_spent", "customer_id"], descending=[True, False]
+        )
 
-        # 5. Vendas diárias (Lazy Evaluation)
-        daily_sales_lazy = joined_df.lazy().with_columns(
+    @staticmethod
+    def _daily_sales(joined_df: pl.DataFrame) -> pl.LazyFrame:
+        return joined_df.lazy().with_columns(
             pl.col("order_date").cast(pl.Date).alias("day")
         ).group_by("day").agg(
             pl.sum("total_sale_value").alias("daily_revenue")
         ).sort("day")
 
+    def process_sales_data(self, sales_df: pl.DataFrame, customer_df: pl.DataFrame):
+        # 1. Calcular o valor total da venda
+        sales_df = self._accounted("total_sale_value", self._add_total_sale_value)(sales_df)
+
+        # 2. Juntar com dados de clientes
+        joined_df = self._accounted("join_customers", self._join_customers)(sales_df, customer_df)
+
+        # 3. Análise de vendas por categoria e região
+        sales_summary = self._accounted("sales_summary", self._summarize_sales)(joined_df)
+
+        # 4. Clientes com maior gasto (Top 5)
+        top_customers = self._accounted("top_customers", self._top_customers)(joined_df)
+
+        # 5. Vendas diárias (Lazy Evaluation)
+        daily_sales_lazy = self._daily_sales(joined_df)
+
         print("\n--- Resumo de Vendas por Categoria e Região ---")
         print(sales_summary)
         print("\n--- Top 5 Clientes por Gasto Total ---")
@@ -75,6 +118,34 @@ class AdvancedPolarsProcessor:
 
         return sales_summary, top_customers, daily_sales_lazy.collect()
 
+    def process_sales_files(self, top_n: int = 5):
+        """
+        Executa a mesma analise de `process_sales_data` a partir dos arquivos em
+        `data_dir`, materializando cada etapa no cache (se houver). Cada etapa so
+        e recalculada quando seus arquivos de entrada, etapas anteriores ou
+        parametros mudam; mudar `top_n` reaproveita a leitura, o calculo e o join.
+        """
+        sales_path = os.path.join(self.data_dir, "sales_data.csv")
+        customer_path = os.path.join(self.data_dir, "customer_data.parquet")
+        add_total = self._accounted("total_sale_value", self._add_total_sale_value)
+        join = self._accounted("join_customers", self._join_customers)
+        summarize = self._accounted("sales_summary", self._summarize_sales)
+        top_customers = self._accounted("top_customers", lambda df: self._top_customers(df, top_n))
+        daily_sales = self._accounted("daily_sales", lambda df: self._daily_sales(df).collect())
+        if self.cache is None:
+            joined_df = join(add_total(self._read_sales(sales_path)), pl.read_parquet(customer_path))
+            return summarize(joined_df), top_customers(joined_df), daily_sales(joined_df)
+
+        cache = self.cache
+        sales = cache.stage("read_sales", self._read_sales, [sales_path])
+        customers = cache.stage("load_customers", pl.read_parquet, [customer_path])
+        enriched = cache.stage("total_sale_value", add_total, [sales])
+        joined = cache.stage("join_customers", join, [enriched, customers])
+        summary = cache.stage("sales_summary", summarize, [joined])
+        top = cache.stage("top_customers", top_customers, [joined], params={"top_n": top_n})
+        daily = cache.stage("daily_sales", daily_sales, [joined])
+        return summary.result(), top.result(), daily.result()
+
 if __name__ == "__main__":
     processor = AdvancedPolarsProcessor()
     sales_df, customer_df = processor.create_sample_data()
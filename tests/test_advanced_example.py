@@ -8,6 +8,7 @@ import shutil
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from examples.advanced_example import AdvancedPolarsProcessor
+from core.stage_cache import StageCache
 
 
 class TestAdvancedPolarsProcessor(unittest.TestCase):
@@ -115,6 +116,37 @@ class TestAdvancedPolarsProcessor(unittest.TestCase):
         customer_set = set(unique_customers.to_list())
         self.assertTrue(sales_customer_set.issubset(customer_set))
 
+    def test_top_customers_breaks_ties_by_customer_id(self):
+        """Test equal totals are selected and ordered deterministically."""
+        joined = pl.DataFrame({
+            "customer_id": ["CUST_9", "CUST_3", "CUST_5", "CUST_1"],
+            "total_sale_value": [10.0, 10.0, 10.0, 20.0],
+        })
+        result = AdvancedPolarsProcessor._top_customers(joined, top_n=3)
+        self.assertEqual(result["customer_id"].to_list(), ["CUST_1", "CUST_3", "CUST_5"])
+
+    def test_process_sales_files_cached(self):
+        """Test that cached pipeline stages are reused across runs."""
+        self.processor.create_sample_data()
+        expected = self.processor.process_sales_files()
+
+        cache = StageCache(os.path.join(self.test_dir, "cache"))
+        self.processor.cache = cache
+        first = self.processor.process_sales_files()
+        for result, reference in zip(first, expected):
+            self.assertTrue(result.equals(reference))
+
+        # Only the last step changes: upstream stages come from the cache
+        misses = cache.misses
+        summary, top_customers, _ = self.processor.process_sales_files(top_n=3)
+        self.assertEqual(cache.misses - misses, 1)
+        self.assertEqual(top_customers.shape[0], 3)
+        self.assertTrue(summary.equals(expected[0]))
+
+        # load_data reuses the parsed CSV while the file is unchanged
+        sales_df, _ = self.processor.load_data()
+        self.assertEqual(sales_df.shape[0], 1000)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
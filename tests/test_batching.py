@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import polars as pl
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core import batching
+from core.polars_demo import PolarsDataProcessor
+
+
+class TestBatching(unittest.TestCase):
+    def setUp(self):
+        self.processor = PolarsDataProcessor()
+        self.test_dir = tempfile.mkdtemp()
+        self.df = pl.DataFrame({
+            "order_id": list(range(2500)),
+            "price": [float(i % 50) for i in range(2500)],
+            "quantity": [1 + i % 5 for i in range(2500)],
+        })
+        self.csv_file = os.path.join(self.test_dir, "orders.csv")
+        self.df.write_csv(self.csv_file)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_read_csv_batches_fixed_size(self):
+        """Test that batches have a fixed size and cover the whole file."""
+        batches = list(self.processor.read_csv_batches(self.csv_file, batch_size=1000))
+        self.assertEqual([b.height for b in batches], [1000, 1000, 500])
+        self.assertTrue(pl.concat(batches).equals(self.df))
+
+    def test_adaptive_batch_size(self):
+        """Test that the adaptive batch size stays within bounds."""
+        size = batching.adaptive_batch_size(self.csv_file)
+        self.assertGreaterEqual(size, batching.MIN_BATCH_ROWS)
+        self.assertLessEqual(size, batching.MAX_BATCH_ROWS)
+
+    def test_write_batches_to_dataset(self):
+        """Test incremental, transformed writes to a Parquet dataset."""
+        dataset_dir = os.path.join(self.test_dir, "dataset")
+        batches = self.processor.read_csv_batches(self.csv_file, batch_size=1000)
+        written = self.processor.write_batches_to_dataset(
+            batches, dataset_dir,
+            transform=lambda b: self.processor.filter_by_condition(b, pl.col("quantity") > 2),
+        )
+        self.assertEqual(len(written), 3)
+
+        # Appending continues the part numbering
+        more = self.processor.write_batches_to_dataset(iter([self.df.head(10)]), dataset_dir)
+        self.assertTrue(more[0].endswith("part-00003.parquet"))
+
+        result = pl.scan_parquet(written).collect()
+        self.assertTrue(result.equals(self.df.filter(pl.col("quantity") > 2)))
+
+        # A gap in the numbering never leads to overwriting an existing part
+        os.remove(written[0])
+        gap = self.processor.write_batches_to_dataset(iter([self.df.head(5)]), dataset_dir)
+        self.assertTrue(gap[0].endswith("part-00004.parquet"))
+        self.assertEqual(pl.scan_parquet(more + gap).collect().height, 15)
+
+    def test_sink_csv_to_parquet(self):
+        """Test streaming CSV to Parquet conversion with a lazy transform."""
+        parquet_file = os.path.join(self.test_dir, "orders.parquet")
+        self.processor.sink_csv_to_parquet(
+            self.csv_file, parquet_file,
+            transform=lambda lf: lf.with_columns((pl.col("price") * pl.col("quantity")).alias("total")),
+        )
+        result = pl.read_parquet(parquet_file)
+        self.assertEqual(result.height, 2500)
+        self.assertIn("total", result.columns)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
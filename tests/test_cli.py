@@ -0,0 +1,98 @@
+import unittest
+import sys
+import os
+import subprocess
+import polars as pl
+import tempfile
+import shutil
+from contextlib import redirect_stdout
+from io import StringIO
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+from core.cli import main
+from examples.advanced_example import AdvancedPolarsProcessor
+
+# Import cost of the processor on top of a bare `import polars`
+PROCESSOR_IMPORT_OVERHEAD_SECONDS = 0.03
+
+
+def run_python(code):
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC_DIR))
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True,
+        cwd=os.path.join(SRC_DIR, '..'),
+    )
+    return result.stdout.strip()
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.csv_file = os.path.join(self.test_dir, "people.csv")
+        pl.DataFrame({
+            "name": ["Alice", "Bob", "Charlie", "Diana"],
+            "city": ["Paris", "London", "Paris", "London"],
+            "age": [25, 35, 45, 30],
+        }).write_csv(self.csv_file)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_stats_command(self):
+        """Test grouped statistics written to an output file."""
+        output = os.path.join(self.test_dir, "stats.csv")
+        code = main(["stats", self.csv_file, "--group-col", "city", "--agg-col", "age", "-o", output])
+        self.assertEqual(code, 0)
+        stats = pl.read_csv(output)
+        self.assertEqual(stats["city"].to_list(), ["London", "Paris"])
+        self.assertIn("mean_age", stats.columns)
+
+    def test_filter_and_top_k_commands(self):
+        """Test SQL-expression filters and streaming top-k."""
+        output = os.path.join(self.test_dir, "filtered.parquet")
+        main(["filter", self.csv_file, "--where", "age > 28 AND city = 'London'", "-o", output])
+        self.assertEqual(pl.read_parquet(output)["name"].to_list(), ["Bob", "Diana"])
+
+        buffer = StringIO()
+        with redirect_stdout(buffer):
+            main(["top-k", self.csv_file, "--by", "age", "-k", "1"])
+        self.assertIn("Charlie", buffer.getvalue())
+
+    def test_convert_command(self):
+        """Test CSV to Parquet conversion."""
+        target = os.path.join(self.test_dir, "people.parquet")
+        main(["convert", self.csv_file, target])
+        self.assertEqual(pl.read_parquet(target).shape, (4, 3))
+
+    def test_cli_import_is_lazy(self):
+        """Test that importing the CLI and the packages does not load Polars."""
+        loaded = run_python(
+            "import sys, src, core, core.cli; print('polars' in sys.modules)"
+        )
+        self.assertEqual(loaded, "False")
+
+    def test_processor_import_budget(self):
+        """Test that importing the processor costs little beyond importing Polars."""
+        code = (
+            "import sys, time; import polars; t = time.perf_counter(); import core.polars_demo; "
+            "print(time.perf_counter() - t); print(sorted(m for m in sys.modules if m.startswith('core.')))"
+        )
+        runs = [run_python(code).splitlines() for _ in range(3)]
+        self.assertLess(min(float(elapsed) for elapsed, _ in runs), PROCESSOR_IMPORT_OVERHEAD_SECONDS)
+        # Optional subsystems (indexes, spilling, UDFs...) load on first use
+        self.assertEqual(runs[0][1], str(["core.batching", "core.memory", "core.polars_demo"]))
+
+    def test_processor_construction_has_no_side_effects(self):
+        """Test that constructing the processor does not touch the filesystem."""
+        data_dir = os.path.join(self.test_dir, "data")
+        processor = AdvancedPolarsProcessor(data_dir=data_dir)
+        self.assertFalse(os.path.exists(data_dir))
+        processor.create_sample_data()
+        self.assertTrue(os.path.exists(data_dir))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
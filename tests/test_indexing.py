@@ -0,0 +1,143 @@
+import unittest
+import sys
+import os
+import timeit
+import polars as pl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.indexing import IndexRegistry, parse_index_predicate
+from core.polars_demo import PolarsDataProcessor
+
+
+class TestIndexing(unittest.TestCase):
+    def setUp(self):
+        self.processor = PolarsDataProcessor()
+        self.df = pl.DataFrame({
+            "customer_id": [f"CUST_{i % 7}" for i in range(50)],
+            "amount": [float((i * 13) % 40) for i in range(50)],
+            "order_id": list(range(50)),
+        })
+
+    def assert_same_as_scan(self, condition):
+        expected = self.df.filter(condition)
+        result = self.processor.filter_by_condition(self.df, condition)
+        self.assertTrue(result.equals(expected))
+
+    def test_parse_index_predicate(self):
+        """Test recognition of simple predicates on a single column."""
+        self.assertEqual(
+            parse_index_predicate(pl.col("a") == 3), ("a", "eq", 3, 3, True, True)
+        )
+        self.assertEqual(
+            parse_index_predicate((pl.col("a") >= 3) & (pl.col("a") < 5)),
+            ("a", "range", 3, 5, True, False),
+        )
+        self.assertEqual(
+            parse_index_predicate(pl.lit(10) > pl.col("a")),
+            ("a", "range", None, 10, True, False),
+        )
+        self.assertIsNone(parse_index_predicate((pl.col("a") > 1) & (pl.col("b") > 1)))
+        self.assertIsNone(parse_index_predicate(pl.col("a").is_null()))
+
+    def test_hash_index_equality(self):
+        """Test equality filters served by a hash index match a full scan."""
+        self.processor.create_index(self.df, "customer_id", kind="hash")
+        self.assert_same_as_scan(pl.col("customer_id") == "CUST_3")
+        self.assert_same_as_scan(pl.col("customer_id") == "MISSING")
+        # Predicates the index cannot serve fall back to a scan
+        self.assert_same_as_scan(pl.col("customer_id").str.ends_with("3"))
+
+    def test_sorted_index_ranges(self):
+        """Test range filters served by a sorted index match a full scan."""
+        self.processor.create_index(self.df, "amount", kind="sorted")
+        self.assert_same_as_scan(pl.col("amount") == 13.0)
+        self.assert_same_as_scan(pl.col("amount") > 20)
+        self.assert_same_as_scan((pl.col("amount") >= 5) & (pl.col("amount") <= 12))
+        self.assert_same_as_scan((pl.col("amount") > 30) & (pl.col("amount") < 10))
+
+    def test_index_is_used(self):
+        """Test that the registry answers indexed predicates."""
+        registry = IndexRegistry()
+        self.assertIsNone(registry.filter(self.df, pl.col("order_id") == 1))
+        registry.create_index(self.df, "order_id")
+        self.assertEqual(registry.filter(self.df, pl.col("order_id") == 1).shape[0], 1)
+
+    def test_index_invalidation(self):
+        """Test that indexes are dropped when the frame changes."""
+        registry = IndexRegistry()
+        df = self.df.clone()
+        registry.create_index(df, "order_id")
+        self.assertIsNotNone(registry.get_index(df, "order_id"))
+
+        df.insert_column(0, pl.Series("extra", [0] * df.height))
+        self.assertIsNone(registry.get_index(df, "order_id"))
+
+        registry.create_index(df, "order_id")
+        registry.invalidate(df)
+        self.assertIsNone(registry.get_index(df, "order_id"))
+
+        other = self.df.clone()
+        registry.create_index(other, "order_id")
+        self.assertIsNone(registry.get_index(self.df, "order_id"))
+
+    def test_index_invalidation_on_value_changes(self):
+        """Test that in-place value changes drop the column's index."""
+        registry = IndexRegistry()
+        df = pl.DataFrame({"k": [1, 2, 3], "v": ["a", "b", "c"]})
+        registry.create_index(df, "k")
+        registry.create_index(df, "v")
+        df[0, "k"] = 99
+        self.assertIsNone(registry.get_index(df, "k"))
+        self.assertIsNone(registry.filter(df, pl.col("k") == 1))
+        self.assertIsNotNone(registry.get_index(df, "v"))
+
+        df.replace_column(1, pl.Series("v", ["x", "y", "z"]))
+        self.assertIsNone(registry.filter(df, pl.col("v") == "a"))
+
+        registry.create_index(df, "k")
+        df[[1, 2], "k"] = [7, 8]
+        self.assertIsNone(registry.get_index(df, "k"))
+
+    def test_mismatched_literal_falls_back(self):
+        """Test that a literal of another type is left to the regular filter."""
+        registry = IndexRegistry()
+        df = pl.DataFrame({"s": ["1", "2"], "x": [1.5, 2.0]})
+        registry.create_index(df, "s")
+        registry.create_index(df, "x", kind="sorted")
+        self.assertIsNone(registry.filter(df, pl.col("s") == 1))
+        self.assertEqual(registry.filter(df, pl.col("x") >= 2).shape[0], 1)
+
+    def test_nan_and_inf_literals(self):
+        """Test NaN/inf literals never break a filter on an indexed frame."""
+        df = pl.DataFrame({"x": [1.0, float("nan"), float("inf"), -2.0, None]})
+        self.processor.create_index(df, "x", kind="sorted")
+        for condition in (
+            pl.col("x") == float("nan"),
+            pl.col("x") > float("inf"),
+            pl.col("x") >= float("inf"),
+            pl.col("x") < float("inf"),
+            pl.col("x") > 0,
+            (pl.col("x") > float("-inf")) & (pl.col("x") <= 1),
+        ):
+            expected = df.filter(condition)
+            self.assertTrue(self.processor.filter_by_condition(df, condition).equals(expected), condition)
+
+    def test_index_beats_scan(self):
+        """Benchmark: repeated indexed lookups on a resident frame are faster than scans."""
+        n = 1_000_000
+        df = pl.DataFrame({"customer_id": range(n), "amount": range(n)})
+        self.processor.create_index(df, "customer_id", kind="hash")
+        self.processor.create_index(df, "customer_id", kind="sorted")
+        for make in (lambda i: pl.col("customer_id") == i,
+                     lambda i: (pl.col("customer_id") >= i) & (pl.col("customer_id") < i + 50)):
+            indexed = min(timeit.repeat(
+                lambda: [self.processor.filter_by_condition(df, make(i)) for i in range(0, n, n // 100)],
+                number=1, repeat=5))
+            scan = min(timeit.repeat(
+                lambda: [df.filter(make(i)) for i in range(0, n, n // 100)], number=1, repeat=5))
+            self.assertLess(indexed, scan)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
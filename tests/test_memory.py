@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import polars as pl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.memory import MemoryBudgetExceeded, MemoryGovernor
+from core.polars_demo import PolarsDataProcessor
+from examples.advanced_example import AdvancedPolarsProcessor
+
+
+class TestMemoryAccounting(unittest.TestCase):
+    def setUp(self):
+        n = 20_000
+        self.left = pl.DataFrame({"id": range(n), "group": [i % 7 for i in range(n)], "value": range(n)})
+        self.right = pl.DataFrame({"id": range(0, n, 2), "label": [f"L{i}" for i in range(0, n, 2)]})
+        self.input_bytes = self.left.estimated_size() + self.right.estimated_size()
+
+    def test_reports_sizes_and_peak_rss(self):
+        """Test each processor call records input/output sizes and peak RSS."""
+        processor = PolarsDataProcessor(memory=MemoryGovernor())
+        result = processor.perform_join(self.left, self.right, "id")
+        report = processor.memory.last_report
+        self.assertEqual(report.operation, "perform_join")
+        self.assertEqual(report.input_bytes, self.input_bytes)
+        self.assertEqual(report.output_bytes, result.estimated_size())
+        self.assertGreater(report.peak_rss, 0)
+        self.assertIsNone(report.policy)
+
+    def test_fail_fast_before_running(self):
+        """Test the fail policy raises a clear error without calling the operation."""
+        processor = PolarsDataProcessor(memory=MemoryGovernor(call_budget=1_000))
+        with self.assertRaisesRegex(MemoryBudgetExceeded, "perform_join: estimativa"):
+            processor.perform_join(self.left, self.right, "id")
+        self.assertEqual(len(processor.memory.reports), 0)
+
+    def test_spill_uses_out_of_core_join(self):
+        """Test the spill policy passes the budget to operations that support it."""
+        budget = self.input_bytes // 2
+        processor = PolarsDataProcessor(memory=MemoryGovernor(call_budget=budget, policy="spill"))
+        result = processor.perform_join(self.left, self.right, "id")
+        self.assertEqual(processor.memory.last_report.policy, "spill")
+        self.assertEqual(result.sort("id").to_dicts(), self.left.join(self.right, on="id").sort("id").to_dicts())
+        positional = processor.perform_join(self.left, self.right, "id", "inner", None)
+        self.assertEqual(processor.memory.last_report.policy, "spill")
+        self.assertTrue(positional.equals(result))
+
+        summary = processor.calculate_summary_statistics(self.left, "group", "value")
+        self.assertEqual(processor.memory.last_report.policy, "stream")
+        self.assertTrue(summary.equals(PolarsDataProcessor().calculate_summary_statistics(self.left, "group", "value")))
+
+    def test_stream_only_where_supported(self):
+        """Test the stream policy collects with the streaming engine or refuses the call."""
+        governor = MemoryGovernor(call_budget=1_000, policy="stream")
+        engines = []
+        governor.run("collect", lambda df, engine="auto": engines.append(engine) or df, self.left)
+        self.assertEqual(engines, ["streaming"])
+        self.assertEqual(governor.last_report.policy, "stream")
+
+        processor = PolarsDataProcessor(memory=governor)
+        result = processor.filter_by_condition(self.left, pl.col("group") == 3)
+        self.assertTrue(result.equals(self.left.filter(pl.col("group") == 3)))
+        # Arguments passed positionally are overridden, not duplicated
+        result = processor.filter_by_condition(self.left, pl.col("group") == 3, "in-memory")
+        self.assertTrue(result.equals(self.left.filter(pl.col("group") == 3)))
+        self.assertEqual(governor.last_report.policy, "stream")
+        with self.assertRaisesRegex(MemoryBudgetExceeded, "nao suporta execucao em streaming"):
+            processor.handle_missing_data(self.left, column="value")
+        self.assertEqual(governor.last_report.operation, "filter_by_condition")
+
+    def test_downsample_fits_budget(self):
+        """Test the downsample policy samples inputs until the estimate fits."""
+        budget = self.left.estimated_size()
+        processor = PolarsDataProcessor(memory=MemoryGovernor(call_budget=budget, policy="downsample"))
+        result = processor.calculate_summary_statistics(self.left, "group", "value")
+        report = processor.memory.last_report
+        self.assertEqual(report.policy, "downsample")
+        self.assertAlmostEqual(report.sample_fraction, 0.5)
+        self.assertLessEqual(report.estimated_bytes, budget)
+        self.assertLess(result["count"].sum(), self.left.height)
+
+    def test_advanced_processor_steps(self):
+        """Test AdvancedPolarsProcessor reports each pipeline step."""
+        data_dir = tempfile.mkdtemp()
+        try:
+            processor = AdvancedPolarsProcessor(data_dir=data_dir, memory=MemoryGovernor())
+            processor.create_sample_data()
+            processor.process_sales_files()
+            self.assertEqual(
+                [report.operation for report in processor.memory.reports],
+                ["total_sale_value", "join_customers", "sales_summary", "top_customers", "daily_sales"],
+            )
+        finally:
+            shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
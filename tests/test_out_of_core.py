@@ -0,0 +1,112 @@
+import unittest
+import sys
+import os
+import polars as pl
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.memory import MemoryBudgetExceeded
+from core.out_of_core import OutOfCoreExecutor
+from core.polars_demo import PolarsDataProcessor
+
+# Small enough to force several spilled partitions for the frames below
+BUDGET = 150_000
+# Fits a single region of the facts frame, but not the whole frame
+WINDOW_BUDGET = 250_000
+
+
+class TestOutOfCore(unittest.TestCase):
+    def setUp(self):
+        self.processor = PolarsDataProcessor()
+        self.spill_dir = tempfile.mkdtemp()
+        n = 10000
+        self.facts = pl.DataFrame({
+            "customer_id": [f"CUST_{(i * 7) % 450}" if i % 97 else None for i in range(n)],
+            "region": [f"Region_{i % 4}" for i in range(n)],
+            "amount": [float((i * 31) % 1000) for i in range(n)],
+            "order_id": list(range(n)),
+        })
+        self.customers = pl.DataFrame({
+            "customer_id": [f"CUST_{i}" for i in range(0, 500, 2)],
+            "loyalty_status": ["Gold" if i % 10 == 0 else "Bronze" for i in range(0, 500, 2)],
+        })
+
+    def tearDown(self):
+        if os.path.exists(self.spill_dir):
+            shutil.rmtree(self.spill_dir)
+
+    def test_external_sort_matches_in_memory(self):
+        """Test that the external sort produces the in-memory order."""
+        with OutOfCoreExecutor(BUDGET, self.spill_dir) as executor:
+            result = executor.sort(self.facts, ["customer_id", "order_id"], descending=[True, False]).collect()
+            self.assertGreater(len(os.listdir(os.path.join(executor.work_dir, "sorted"))), 1)
+        expected = self.facts.sort(["customer_id", "order_id"], descending=[True, False])
+        self.assertTrue(result.equals(expected))
+
+    def test_grace_join_matches_in_memory(self):
+        """Test that the partitioned join returns the same rows for each join type."""
+        for how in ["inner", "left", "right", "full", "semi", "anti"]:
+            result = self.processor.perform_join(
+                self.facts, self.customers, "customer_id", how=how,
+                memory_budget=BUDGET, spill_dir=self.spill_dir,
+            )
+            expected = self.processor.perform_join(self.facts, self.customers, "customer_id", how=how)
+            self.assertEqual(result.columns, expected.columns)
+            self.assertTrue(result.equals(expected), how)
+
+    def test_out_of_core_window_function(self):
+        """Test window functions computed over spilled, sorted partitions."""
+        result = self.processor.apply_window_function(
+            self.facts, "region", "order_id", "amount",
+            memory_budget=WINDOW_BUDGET, spill_dir=self.spill_dir,
+        )
+        expected = self.processor.apply_window_function(self.facts, "region", "order_id", "amount")
+        self.assertTrue(result.equals(expected))
+
+        # Ties in the order column keep the input order on both paths
+        result = self.processor.apply_window_function(
+            self.facts, "region", "amount", "order_id",
+            memory_budget=WINDOW_BUDGET, spill_dir=self.spill_dir,
+        )
+        expected = self.processor.apply_window_function(self.facts, "region", "amount", "order_id")
+        self.assertTrue(result.equals(expected))
+
+        # A single group larger than the budget is refused instead of loaded whole
+        with self.assertRaisesRegex(MemoryBudgetExceeded, "region='Region_0'"):
+            self.processor.apply_window_function(
+                self.facts.with_columns(region=pl.lit("Region_0")), "region", "order_id", "amount",
+                memory_budget=BUDGET, spill_dir=self.spill_dir,
+            )
+
+    def test_external_sort_low_cardinality_key(self):
+        """Test that a key with one distinct value is merge-sorted within the budget."""
+        facts = self.facts.with_columns(group=pl.lit("g"))
+        with OutOfCoreExecutor(BUDGET, self.spill_dir) as executor:
+            result = executor.sort(facts, ["group", "amount"], descending=[False, True]).collect()
+            self.assertGreater(len(os.listdir(os.path.join(executor.work_dir, "sorted"))), 2)
+        self.assertTrue(result.equals(facts.sort(["group", "amount"], descending=[False, True], maintain_order=True)))
+
+    def test_grace_join_hot_key(self):
+        """Test that a join dominated by one key stays correct and ordered."""
+        facts = self.facts.with_columns(
+            customer_id=pl.when(pl.col("order_id") % 10 > 0).then(pl.lit("CUST_0")).otherwise("customer_id")
+        )
+        for how in ["inner", "left", "anti"]:
+            result = self.processor.perform_join(
+                facts, self.customers, "customer_id", how=how, memory_budget=BUDGET, spill_dir=self.spill_dir,
+            )
+            expected = self.processor.perform_join(facts, self.customers, "customer_id", how=how)
+            self.assertTrue(result.equals(expected), how)
+
+    def test_spill_files_removed(self):
+        """Test that spill files are cleaned up on close."""
+        self.processor.perform_join(
+            self.facts, self.customers, "customer_id", memory_budget=BUDGET, spill_dir=self.spill_dir
+        )
+        self.assertEqual(os.listdir(self.spill_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import json
+import polars as pl
+import tempfile
+import shutil
+import importlib.util
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.parquet_tuning import METADATA_KEY, choose_column_encodings
+from core.polars_demo import PolarsDataProcessor
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+class TestParquetTuning(unittest.TestCase):
+    def setUp(self):
+        self.processor = PolarsDataProcessor()
+        self.test_dir = tempfile.mkdtemp()
+        n = 20000
+        self.df = pl.DataFrame({
+            "order_id": list(range(n)),
+            "category": [f"Category_{i % 3}" for i in range(n)],
+            "price": [float((i * 7919) % 100003) / 7 for i in range(n)],
+            "returned": [i % 11 == 0 for i in range(n)],
+        })
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_column_encodings(self):
+        """Test per-column encoding choices."""
+        encodings = choose_column_encodings(self.df)
+        self.assertEqual(encodings, {
+            "order_id": "DELTA_BINARY_PACKED",
+            "category": "DICTIONARY",
+            "price": "PLAIN",
+            "returned": "RLE",
+        })
+
+    def test_tuned_write(self):
+        """Test that each objective writes a readable file and a report."""
+        for objective in ["smallest", "fastest_read", "balanced"]:
+            path = os.path.join(self.test_dir, f"{objective}.parquet")
+            report = self.processor.write_parquet_tuned(self.df, path, objective=objective)
+            self.assertTrue(pl.read_parquet(path).equals(self.df))
+            self.assertEqual(report.file_size, os.path.getsize(path))
+            self.assertEqual(len(report.candidates), 5)
+            self.assertLessEqual(report.row_group_size, self.df.height)
+
+        smallest = self.processor.write_parquet_tuned(
+            self.df, os.path.join(self.test_dir, "s.parquet"), objective="smallest"
+        )
+        self.assertEqual(
+            min(c["size"] for c in smallest.candidates),
+            next(c["size"] for c in smallest.candidates
+                 if (c["compression"], c["compression_level"])
+                 == (smallest.compression, smallest.compression_level)),
+        )
+
+    def test_sorted_write_metadata(self):
+        """Test sorting before writing and recording the sort order."""
+        path = os.path.join(self.test_dir, "sorted.parquet")
+        report = self.processor.write_parquet_tuned(self.df, path, sort_by=["category", "price"])
+        result = pl.read_parquet(path)
+        self.assertTrue(result.equals(self.df.sort("category", "price")))
+        self.assertEqual(report.sorted_by, ["category", "price"])
+        metadata = json.loads(pl.read_parquet_metadata(path)[METADATA_KEY])
+        self.assertEqual(metadata["sorted_by"], ["category", "price"])
+        self.assertEqual(metadata["compression"], report.compression)
+        self.assertEqual(report.row_group_target_bytes, 128 << 20)
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_pyarrow_encodings_applied(self):
+        """Test that column encodings and metadata are written through pyarrow."""
+        import pyarrow.parquet as pq
+
+        path = os.path.join(self.test_dir, "encoded.parquet")
+        report = self.processor.write_parquet_tuned(self.df, path, sort_by=["order_id"])
+        self.assertTrue(report.encodings_applied)
+        self.assertTrue(pl.read_parquet(path).equals(self.df))
+
+        row_group = pq.ParquetFile(path).metadata.row_group(0)
+        encodings = {
+            row_group.column(i).path_in_schema: row_group.column(i).encodings
+            for i in range(row_group.num_columns)
+        }
+        self.assertIn("DELTA_BINARY_PACKED", encodings["order_id"])
+        self.assertIn("RLE_DICTIONARY", encodings["category"])
+        self.assertNotIn("RLE_DICTIONARY", encodings["price"])
+        metadata = json.loads(pl.read_parquet_metadata(path)[METADATA_KEY])
+        self.assertEqual(metadata["sorted_by"], ["order_id"])
+
+    def test_invalid_objective(self):
+        """Test that unknown objectives are rejected."""
+        with self.assertRaises(ValueError):
+            self.processor.write_parquet_tuned(self.df, os.path.join(self.test_dir, "x.parquet"), objective="tiny")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -142,6 +142,29 @@ class TestPolarsDataProcessor(unittest.TestCase):
         self.assertEqual(result.shape[0], 4)  # Charlie, Eve, Grace, Heidi
         self.assertTrue(all(result["age"] > 30))
 
+    def test_top_k(self):
+        """Test global top-k selection without a full sort."""
+        result = self.processor.top_k(self.df, 3, "monthly_salary")
+        self.assertEqual(result["monthly_salary"].to_list(), [90000, 80000, 70000])
+
+        bottom = self.processor.top_k(self.df, 2, "age", descending=False)
+        self.assertEqual(bottom["age"].to_list(), [22, 25])
+
+    def test_top_k_per_group(self):
+        """Test per-partition top-k selection."""
+        result = self.processor.top_k_per_group(self.df, "city", "monthly_salary", 2)
+        self.assertEqual(result.columns, self.df.columns)
+        self.assertEqual(result.shape[0], 6)
+        ny = result.filter(pl.col("city") == "New York")
+        self.assertEqual(ny["monthly_salary"].to_list(), [60000, 50000])
+
+    def test_top_k_from_file(self):
+        """Test streaming top-k over a scanned file."""
+        parquet_file = os.path.join(self.test_dir, "test_data.parquet")
+        self.processor.write_parquet(self.df, parquet_file)
+        result = self.processor.top_k_from_file(parquet_file, 1, "age")
+        self.assertEqual(result["first_name"].to_list(), ["Heidi"])
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
 
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import polars as pl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.server import AdmissionError, QueryClient, QueryService, make_server
+
+
+class TestQueryServer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.service = QueryService(max_concurrent=2, queue_timeout=0.1)
+        self.service.register("people", pl.DataFrame({
+            "name": ["Alice", "Bob", "Charlie", "Diana"],
+            "city": ["NY", "LA", "NY", "SF"],
+            "age": [25, 30, 35, 28],
+        }))
+        self.server = make_server(self.service, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = QueryClient(port=self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_sql_returns_arrow_stream(self):
+        """Test SQL over a resident table round-trips as Arrow IPC."""
+        result = self.client.sql("SELECT name FROM people WHERE age > 27 ORDER BY age")
+        self.assertEqual(result["name"].to_list(), ["Diana", "Bob", "Charlie"])
+
+    def test_pipeline_and_mmap_table(self):
+        """Test a processor pipeline joining a memory-mapped IPC table."""
+        path = os.path.join(self.temp_dir, "cities.arrow")
+        pl.DataFrame({"city": ["NY", "LA"], "state": ["NY", "CA"]}).write_ipc(path)
+        tables = self.client.register("cities", path, mmap=True)
+        self.assertTrue(tables["cities"]["mmap"])
+
+        result = self.client.pipeline("people", [
+            {"op": "filter", "where": "age >= 30"},
+            {"op": "join", "table": "cities", "on": "city"},
+            {"op": "top_k", "k": 1, "by": "age"},
+        ])
+        self.assertEqual(result.select("name", "state").rows(), [("Charlie", "NY")])
+
+    def test_errors_and_admission_control(self):
+        """Test bad requests map to HTTP errors and a full server rejects work."""
+        with self.assertRaisesRegex(RuntimeError, "HTTP 400"):
+            self.client.pipeline("missing", [])
+        self.service._slots.acquire()
+        self.service._slots.acquire()
+        try:
+            with self.assertRaises(AdmissionError):
+                self.service.sql("SELECT * FROM people")
+            with self.assertRaisesRegex(RuntimeError, "HTTP 503"):
+                self.client.sql("SELECT * FROM people")
+        finally:
+            self.service._slots.release()
+            self.service._slots.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+import polars as pl
+import tempfile
+import shutil
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.schema_inference import SchemaInferenceService, sample_csv_bytes
+from core.polars_demo import PolarsDataProcessor
+
+
+class TestSchemaInference(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.csv_file = os.path.join(self.test_dir, "export.csv")
+        # `amount` looks like an integer column until the very last rows
+        amounts = [str(i) for i in range(4999)] + ["12.5"]
+        self.df = pl.DataFrame({
+            "id": list(range(5000)),
+            "amount": amounts,
+            "code": [f"C{i % 9}" for i in range(5000)],
+        })
+        self.df.write_csv(self.csv_file)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_sample_covers_head_and_tail(self):
+        """Test that the sample includes the header, first and last rows."""
+        sample = sample_csv_bytes(self.csv_file, sample_rows=30)
+        lines = sample.decode().splitlines()
+        self.assertEqual(lines[0], "id,amount,code")
+        self.assertEqual(lines[1], "0,0,C0")
+        self.assertEqual(lines[-1], "4999,12.5,C4")
+
+    def test_infer_detects_late_types(self):
+        """Test that sampled inference sees types that only appear at the end."""
+        with self.assertRaises(pl.exceptions.ComputeError):
+            pl.read_csv(self.csv_file)
+        schema = SchemaInferenceService().infer(self.csv_file)
+        self.assertEqual(schema["amount"], pl.Float64)
+        self.assertEqual(schema["id"], pl.Int64)
+
+    def test_schema_cache_roundtrip(self):
+        """Test that schemas are persisted and reused until the file changes."""
+        cache_dir = os.path.join(self.test_dir, "schemas")
+        service = SchemaInferenceService(cache_dir=cache_dir)
+        schema = service.get_schema(self.csv_file)
+        self.assertTrue(os.path.exists(service.sidecar_path(self.csv_file)))
+
+        with mock.patch.object(service, "infer", side_effect=AssertionError("inferred again")):
+            self.assertEqual(service.get_schema(self.csv_file), schema)
+
+        self.df.head(10).write_csv(self.csv_file)
+        self.assertIsNone(service.load_cached(self.csv_file))
+
+    def test_read_csv_fast(self):
+        """Test reading with an explicit cached schema and the known-clean path."""
+        processor = PolarsDataProcessor()
+        result = processor.read_csv_fast(self.csv_file)
+        self.assertEqual(result.shape, (5000, 3))
+        self.assertEqual(result["amount"].dtype, pl.Float64)
+        self.assertTrue(os.path.exists(self.csv_file + ".schema.json"))
+        self.assertTrue(processor.read_csv_fast(self.csv_file).equals(result))
+
+        clean_file = os.path.join(self.test_dir, "clean.csv")
+        self.df.head(100).write_csv(clean_file)
+        clean = processor.read_csv_fast(clean_file, known_clean=True)
+        self.assertEqual(clean.height, 100)
+        self.assertIsNotNone(processor._schemas.load_cached(clean_file, low_memory=False))
+
+    def test_read_csv_fast_recovers_from_unsampled_type_change(self):
+        """Test a type change outside the sample re-infers and fixes the cached schema."""
+        late_file = os.path.join(self.test_dir, "late.csv")
+        values = [str(i) for i in range(100_000)]
+        values[30_000] = "1.5"
+        with open(late_file, "w") as handle:
+            handle.write("a,b\n" + "".join(f"{i},{v}\n" for i, v in enumerate(values)))
+
+        processor = PolarsDataProcessor()
+        self.assertEqual(processor._schemas.infer(late_file)["b"], pl.Int64)
+        for _ in range(2):
+            result = processor.read_csv_fast(late_file)
+            self.assertEqual(result["b"].dtype, pl.Float64)
+            self.assertEqual(result["b"][30_000], 1.5)
+        self.assertEqual(processor._schemas.load_cached(late_file, low_memory=False)["b"], pl.Float64)
+
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
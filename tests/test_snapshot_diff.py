@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+import polars as pl
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.polars_demo import PolarsDataProcessor
+
+
+class TestSnapshotDiff(unittest.TestCase):
+    def setUp(self):
+        self.processor = PolarsDataProcessor()
+        self.test_dir = tempfile.mkdtemp()
+        self.yesterday = pl.DataFrame({
+            "customer_id": ["CUST_0", "CUST_1", "CUST_2", "CUST_3"],
+            "region": ["Region_0", "Region_1", "Region_2", "Region_3"],
+            "loyalty_status": ["Gold", "Bronze", None, "Silver"],
+        })
+        self.today = pl.DataFrame({
+            "customer_id": ["CUST_0", "CUST_1", "CUST_2", "CUST_4"],
+            "region": ["Region_0", "Region_2", "Region_2", "Region_0"],
+            "loyalty_status": ["Gold", "Bronze", "Silver", "Bronze"],
+        })
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_diff_snapshots(self):
+        """Test inserted, deleted and updated rows with change masks."""
+        diff = self.processor.diff_snapshots(self.yesterday, self.today, "customer_id")
+        self.assertEqual(diff.inserted["customer_id"].to_list(), ["CUST_4"])
+        self.assertEqual(diff.inserted.columns, self.today.columns)
+        self.assertEqual(diff.deleted["customer_id"].to_list(), ["CUST_3"])
+        self.assertEqual(diff.deleted["region"].to_list(), ["Region_3"])
+
+        updated = diff.updated.sort("customer_id")
+        self.assertEqual(updated["customer_id"].to_list(), ["CUST_1", "CUST_2"])
+        self.assertEqual(updated["region"].to_list(), ["Region_2", "Region_2"])
+        self.assertEqual(updated["changed_region"].to_list(), [True, False])
+        self.assertEqual(updated["changed_loyalty_status"].to_list(), [False, True])
+
+    def test_diff_snapshots_from_scans(self):
+        """Test diffing scanned Parquet snapshots."""
+        old_file = os.path.join(self.test_dir, "old.parquet")
+        new_file = os.path.join(self.test_dir, "new.parquet")
+        self.yesterday.write_parquet(old_file)
+        self.today.write_parquet(new_file)
+        inserted, deleted, updated = self.processor.diff_snapshots(
+            pl.scan_parquet(old_file), pl.scan_parquet(new_file), "customer_id", columns=["region"]
+        )
+        self.assertEqual(inserted.height, 1)
+        self.assertEqual(deleted.height, 1)
+        self.assertEqual(updated["customer_id"].to_list(), ["CUST_1"])
+
+    def test_diff_snapshots_without_value_columns(self):
+        """Test key-only snapshots and an empty column list."""
+        diff = self.processor.diff_snapshots(
+            self.yesterday.select("customer_id"), self.today.select("customer_id"), key="customer_id"
+        )
+        self.assertEqual(diff.inserted["customer_id"].to_list(), ["CUST_4"])
+        self.assertEqual(diff.deleted["customer_id"].to_list(), ["CUST_3"])
+        self.assertEqual(diff.updated.height, 0)
+
+        diff = self.processor.diff_snapshots(self.yesterday, self.today, key="customer_id", columns=[])
+        self.assertEqual((diff.inserted.height, diff.deleted.height, diff.updated.height), (1, 1, 0))
+        self.assertEqual(diff.updated.columns, self.today.columns)
+
+    def test_deduplicate(self):
+        """Test exact and key-based deduplication, in memory and out of core."""
+        df = pl.DataFrame({
+            "order_id": [i % 300 for i in range(1200)],
+            "amount": [float(i % 2) for i in range(1200)],
+            "seq": list(range(1200)),
+        })
+        exact = self.processor.deduplicate(df.select("order_id", "amount"))
+        self.assertEqual(exact.height, 300)
+
+        first = self.processor.deduplicate(df, subset=["order_id"])
+        last = self.processor.deduplicate(df, subset=["order_id"], keep="last")
+        self.assertEqual(first["seq"].to_list(), list(range(300)))
+        self.assertEqual(last["seq"].to_list(), list(range(900, 1200)))
+
+        spilled = self.processor.deduplicate(
+            df, subset=["order_id"], keep="last", memory_budget=10_000, spill_dir=self.test_dir
+        )
+        self.assertTrue(spilled.equals(last))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+import time
+import polars as pl
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.stage_cache import StageCache
+
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+        self.csv_file = os.path.join(self.test_dir, "input.csv")
+        pl.DataFrame({"a": [1, 2, 3], "b": [10, 20, 30]}).write_csv(self.csv_file)
+        self.calls = []
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def load(self, path):
+        self.calls.append("load")
+        return pl.read_csv(path)
+
+    def pipeline(self, cache, factor):
+        loaded = cache.stage("load", self.load, [self.csv_file])
+
+        def scale(df):
+            self.calls.append("scale")
+            return df.with_columns(pl.col("b") * factor)
+
+        return cache.stage("scale", scale, [loaded], params={"factor": factor})
+
+    def test_results_persist_across_instances(self):
+        """Test that a new cache instance reads results from disk."""
+        first = self.pipeline(StageCache(self.cache_dir), 2).result()
+        second = self.pipeline(StageCache(self.cache_dir), 2).result()
+        self.assertTrue(first.equals(second))
+        self.assertEqual(self.calls, ["load", "scale"])
+
+    def test_param_change_skips_upstream(self):
+        """Test that changing a stage parameter only recomputes that stage."""
+        cache = StageCache(self.cache_dir)
+        self.pipeline(cache, 2).result()
+        result = self.pipeline(StageCache(self.cache_dir), 3).result()
+        self.assertEqual(self.calls, ["load", "scale", "scale"])
+        self.assertEqual(result["b"].to_list(), [30, 60, 90])
+
+    def test_code_change_invalidates(self):
+        """Test that editing a stage's function recomputes it without touching upstream."""
+        def last_stage(cache, compute, version=None):
+            loaded = cache.stage("load", self.load, [self.csv_file])
+            return cache.stage("total", compute, [loaded], version=version)
+
+        cache = StageCache(self.cache_dir)
+        versions = [
+            lambda df: df.select(pl.col("b").sum()),
+            lambda df: df.select(pl.col("b").sum()),
+            lambda df: df.select(pl.col("b").max()),
+            lambda df: df.select(pl.col("b").max() + 1),
+        ]
+        results = [last_stage(cache, compute).result()["b"].item() for compute in versions]
+        self.assertEqual(results, [60, 60, 30, 31])
+        self.assertEqual(self.calls, ["load"])
+
+        key = last_stage(cache, versions[0]).key
+        self.assertNotEqual(last_stage(cache, versions[0], version="2").key, key)
+
+    def test_input_change_invalidates(self):
+        """Test that modifying an input file changes the stage keys."""
+        cache = StageCache(self.cache_dir)
+        key = self.pipeline(cache, 2).key
+        pl.DataFrame({"a": [1], "b": [5]}).write_csv(self.csv_file)
+        stage = self.pipeline(cache, 2)
+        self.assertNotEqual(stage.key, key)
+        self.assertEqual(stage.result()["b"].to_list(), [10])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entries are evicted first."""
+        for memory_max_bytes in (0, 1 << 20):
+            with self.subTest(memory_max_bytes=memory_max_bytes):
+                cache = StageCache(os.path.join(self.cache_dir, str(memory_max_bytes)),
+                                   memory_max_bytes=memory_max_bytes)
+                self.check_lru(cache)
+
+    def check_lru(self, cache):
+        df = pl.DataFrame({"x": list(range(1000))})
+        cache.put("old", df)
+        time.sleep(0.01)
+        cache.put("recent", df)
+        time.sleep(0.01)
+        cache.get("old")
+        entry_size = os.path.getsize(os.path.join(cache.cache_dir, "old.ipc"))
+
+        cache.max_bytes = entry_size * 2
+        time.sleep(0.01)
+        cache.put("new", df)
+        self.assertIsNotNone(cache.get("old"))
+        self.assertIsNone(cache.get("recent"))
+        self.assertIsNotNone(cache.get("new"))
+
+    def test_memory_tier(self):
+        """Test that hot entries are served from memory."""
+        cache = StageCache(self.cache_dir)
+        df = pl.DataFrame({"x": [1, 2, 3]})
+        cache.put("hot", df)
+        os.remove(os.path.join(self.cache_dir, "hot.ipc"))
+        self.assertTrue(cache.get("hot").equals(df))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
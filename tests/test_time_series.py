@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+import datetime as dt
+import polars as pl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.time_series import ensure_time_sorted, is_time_sorted
+from core.polars_demo import PolarsDataProcessor
+
+
+class TestTimeSeries(unittest.TestCase):
+    def setUp(self):
+        self.processor = PolarsDataProcessor()
+        self.sales = pl.DataFrame({
+            "order_date": [dt.date(2024, 1, 1), dt.date(2024, 1, 2), dt.date(2024, 1, 3),
+                           dt.date(2024, 1, 20), dt.date(2024, 2, 9)],
+            "category": ["A", "A", "B", "A", "B"],
+            "revenue": [10.0, 20.0, 40.0, 30.0, 50.0],
+        })
+        self.prices = pl.DataFrame({
+            "order_date": [dt.date(2023, 12, 30), dt.date(2024, 1, 2), dt.date(2024, 1, 19)],
+            "category": ["A", "A", "B"],
+            "price": [1.0, 1.1, 2.0],
+        })
+
+    def test_resample_weekly_with_gap_fill(self):
+        """Test weekly buckets per group with zero-filled gaps."""
+        result = self.processor.resample_time_series(
+            self.sales, "order_date", "1w", [pl.sum("revenue").alias("weekly_revenue")],
+            by="category", fill="zero",
+        )
+        category_a = result.filter(pl.col("category") == "A")
+        self.assertEqual(
+            category_a["order_date"].to_list(),
+            [dt.date(2024, 1, 1), dt.date(2024, 1, 8), dt.date(2024, 1, 15)],
+        )
+        self.assertEqual(category_a["weekly_revenue"].to_list(), [30.0, 0.0, 30.0])
+        self.assertEqual(result.filter(pl.col("category") == "B").height, 6)
+
+    def test_resample_monthly_forward_fill(self):
+        """Test monthly buckets and forward fill."""
+        monthly = self.processor.resample_time_series(
+            self.sales, "order_date", "1mo", [pl.sum("revenue")]
+        )
+        self.assertEqual(monthly["revenue"].to_list(), [100.0, 50.0])
+
+        daily = self.processor.resample_time_series(
+            self.sales.head(4), "order_date", "1d", [pl.last("revenue")], fill="forward"
+        )
+        self.assertEqual(daily.height, 20)
+        self.assertEqual(daily["revenue"].null_count(), 0)
+        self.assertEqual(daily["revenue"][10], 40.0)
+
+    def test_presorted_data_is_not_resorted(self):
+        """Test that sorted input is returned without sorting."""
+        self.assertTrue(is_time_sorted(self.sales, "order_date", "category"))
+        self.assertIs(ensure_time_sorted(self.sales, "order_date", "category"), self.sales)
+
+        shuffled = self.sales.reverse()
+        self.assertFalse(is_time_sorted(shuffled, "order_date"))
+        self.assertTrue(ensure_time_sorted(shuffled, "order_date")["order_date"].is_sorted())
+
+    def test_asof_join(self):
+        """Test as-of alignment with tolerance and by-keys."""
+        result = self.processor.asof_join(
+            self.sales.reverse(), self.prices, "order_date", by="category", tolerance="3d"
+        )
+        expected = self.sales.sort("category", "order_date")
+        self.assertEqual(result["order_date"].to_list(), expected["order_date"].to_list())
+        self.assertEqual(result["price"].to_list(), [1.0, 1.1, None, None, None])
+
+    def test_asof_join_sorted_within_groups(self):
+        """Test by-key data sorted only within each group keeps its row order."""
+        grouped = self.sales.sort("category", "order_date")
+        prices = self.prices.sort("category", "order_date", descending=[True, False])
+        self.assertFalse(is_time_sorted(grouped, "order_date"))
+        self.assertTrue(is_time_sorted(grouped, "order_date", "category"))
+
+        result = self.processor.asof_join(grouped, prices, "order_date", by="category")
+        self.assertTrue(result.select(grouped.columns).equals(grouped))
+        self.assertEqual(result["price"].to_list(), [1.0, 1.1, 1.1, None, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import warnings
+import importlib.util
+import polars as pl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.polars_demo import PolarsDataProcessor
+from core.udf import UDFLintWarning, lint_row_udf
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+
+
+def clipped_score(values: pl.Series) -> pl.Series:
+    return values.clip(0, 100) / 100
+
+
+class TestUDF(unittest.TestCase):
+    def setUp(self):
+        self.processor = PolarsDataProcessor()
+        self.df = pl.DataFrame({"score": [-5, 50, 120], "weight": [1.0, 2.0, 0.5]})
+
+    def test_series_udf_runs_via_map_batches(self):
+        """Test batch UDFs on one and several columns with declared dtypes."""
+        self.processor.register_udf("clipped", clipped_score, pl.Float64)
+        self.processor.register_udf("weighted", lambda s, w: s * w, pl.Float32)
+        result = self.processor.apply_udf(self.df, "clipped", "score")
+        self.assertEqual(result["clipped"].to_list(), [0.0, 0.5, 1.0])
+
+        weighted = self.df.lazy().select(self.processor.udf("weighted", "score", "weight")).collect()
+        self.assertEqual(weighted.schema["weighted"], pl.Float32)
+        self.assertEqual(weighted["weighted"].to_list(), [-5.0, 100.0, 60.0])
+
+    def test_whole_column_udf_sees_all_rows(self):
+        """Test UDFs not declared elementwise are not split or moved past filters."""
+        self.processor.register_udf("centered", lambda s: s - s.mean(), pl.Float64)
+        self.processor.register_udf("halved", lambda s: s / 2, pl.Float64, elementwise=True)
+        self.assertFalse(self.processor._udfs.get("centered").elementwise)
+        result = (
+            self.df.lazy()
+            .with_columns(self.processor.udf("centered", "score"), self.processor.udf("halved", "score"))
+            .filter(pl.col("score") > 0)
+            .collect()
+        )
+        self.assertEqual(result["centered"].to_list(), [-5.0, 65.0])
+        self.assertEqual(result["halved"].to_list(), [25.0, 60.0])
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+    def test_numpy_udf(self):
+        """Test NumPy UDFs receive arrays and are cast to the declared dtype."""
+        import numpy as np
+
+        self.processor.register_udf("log_weight", lambda w: np.log2(w), pl.Float32, kind="numpy", elementwise=True)
+        result = self.processor.apply_udf(self.df, "log_weight", "weight")
+        self.assertEqual(result.schema["log_weight"], pl.Float32)
+        self.assertEqual(result["log_weight"].to_list(), [0.0, 1.0, -1.0])
+
+    @unittest.skipUnless(HAS_NUMPY and HAS_NUMBA, "numpy/numba are not installed")
+    def test_numba_jit_udf(self):
+        """Test jit=True compiles NumPy UDFs with Numba."""
+        import numpy as np
+
+        def scaled(scores, weights):
+            out = np.empty(scores.shape[0])
+            for i in range(scores.shape[0]):
+                out[i] = scores[i] * weights[i]
+            return out
+
+        udf = self.processor.register_udf("scaled", scaled, pl.Float64, kind="numpy", jit=True, elementwise=True)
+        self.assertTrue(udf.jit)
+        result = self.processor.apply_udf(self.df, "scaled", ["score", "weight"])
+        self.assertEqual(result["scaled"].to_list(), [-5.0, 100.0, 60.0])
+
+    def test_row_udf_lint(self):
+        """Test row-wise UDFs that are native expressions in disguise are flagged."""
+        self.assertIsNotNone(lint_row_udf(lambda x: x * 2 + 1))
+        self.assertIsNone(lint_row_udf(lambda x: x if x > 0 else 0))
+
+        with self.assertWarns(UDFLintWarning):
+            self.processor.register_udf("double", lambda x: x * 2, pl.Int64, kind="row")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", UDFLintWarning)
+            self.processor.register_udf("positive", lambda x: x if x > 0 else 0, pl.Int64, kind="row")
+        result = self.processor.apply_udf(self.df, "positive", "score")
+        self.assertEqual(result["positive"].to_list(), [0, 50, 120])
+
+    def test_unknown_udf_and_kind(self):
+        """Test invalid registrations and lookups raise clear errors."""
+        with self.assertRaises(ValueError):
+            self.processor.register_udf("bad", clipped_score, pl.Float64, kind="scalar")
+        with self.assertRaises(KeyError):
+            self.processor.udf("missing", "score")
+
+
+if __name__ == '__main__':
+    unittest.main()